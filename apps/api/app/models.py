@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, DateTime, func, Integer, ForeignKey, Enum, BigInteger, Text, Float
+from sqlalchemy import Column, String, DateTime, func, Integer, ForeignKey, BigInteger, Text, Float
+from sqlalchemy.types import SmallInteger, TypeDecorator
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from enum import Enum as PyEnum
 from .db import Base
@@ -18,6 +19,49 @@ class EventType(PyEnum):
     EXTRACTION_COMPLETED = "extraction_completed"
     MANUAL_REVIEW_STARTED = "manual_review_started"
 
+# Stable SMALLINT codes persisted in the database. Never renumber an existing
+# member; append new ones with the next free code.
+PROCESSING_STATUS_CODES = {
+    ProcessingStatus.UPLOADED: 1,
+    ProcessingStatus.PROCESSING: 2,
+    ProcessingStatus.COMPLETED: 3,
+    ProcessingStatus.FAILED: 4,
+    ProcessingStatus.RETRYING: 5,
+}
+
+EVENT_TYPE_CODES = {
+    EventType.DOCUMENT_UPLOADED: 1,
+    EventType.PROCESSING_STARTED: 2,
+    EventType.PROCESSING_COMPLETED: 3,
+    EventType.PROCESSING_FAILED: 4,
+    EventType.EXTRACTION_COMPLETED: 5,
+    EventType.MANUAL_REVIEW_STARTED: 6,
+}
+
+class SmallIntEnum(TypeDecorator):
+    """Persist a Python enum as a SMALLINT code instead of a Postgres ENUM type."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls, codes):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._to_code = dict(codes)
+        self._from_code = {code: member for member, code in self._to_code.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_cls):
+            value = self.enum_cls(value)
+        return self._to_code[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._from_code[value]
+
 class Document(Base):
     __tablename__ = "documents"
 
@@ -29,7 +73,10 @@ class Document(Base):
     sha256_hash: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
     sha256_raw: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
     sha256_canonical: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
-    processing_status: Mapped[ProcessingStatus] = mapped_column(Enum(ProcessingStatus), default=ProcessingStatus.UPLOADED)
+    processing_status: Mapped[ProcessingStatus] = mapped_column(
+        SmallIntEnum(ProcessingStatus, PROCESSING_STATUS_CODES),
+        default=ProcessingStatus.UPLOADED,
+    )
     error_message: Mapped[str] = mapped_column(Text, nullable=True)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -56,7 +103,9 @@ class ProcessingEvent(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     document_id: Mapped[str] = mapped_column(String, ForeignKey("documents.id"), nullable=False)
-    event_type: Mapped[EventType] = mapped_column(Enum(EventType), nullable=False)
+    event_type: Mapped[EventType] = mapped_column(
+        SmallIntEnum(EventType, EVENT_TYPE_CODES), nullable=False
+    )
     message: Mapped[str] = mapped_column(Text, nullable=True)
     event_metadata: Mapped[str] = mapped_column(Text, nullable=True)  # JSON string
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
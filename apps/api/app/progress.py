@@ -1,9 +1,10 @@
 """Server-sent events progress helpers."""
 from __future__ import annotations
 
-import json
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
 
 from apps.api.config import settings
 from apps.api.infra.redis import get_redis_connection
@@ -13,9 +14,10 @@ PROGRESS_KEY_TEMPLATE = "job:{job_id}:progress"
 PROGRESS_CHANNEL = "jobs:progress"
 
 
-def _serialize_snapshot(job_id: str, snapshot: Dict[str, Any]) -> str:
+def _serialize_snapshot(job_id: str, snapshot: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
     payload = {"job_id": job_id, "timestamp": time.time(), **snapshot}
-    return json.dumps(payload, default=str)
+    # Redis takes the bytes as-is for both SETEX and PUBLISH
+    return payload, orjson.dumps(payload, default=str)
 
 
 def write_progress_snapshot(
@@ -24,20 +26,31 @@ def write_progress_snapshot(
     *,
     ttl: Optional[int] = None,
     connection=None,
+    pipeline=None,
 ) -> Dict[str, Any]:
-    """Persist job progress into Redis and publish to subscribers."""
+    """Persist job progress into Redis and publish to subscribers.
+
+    The write, the publish and, for finished jobs, the duration sample share
+    one pipeline so a snapshot costs a single Redis round-trip. Pass
+    ``pipeline`` to queue them on the caller's pipeline
+    instead; the caller is then responsible for executing it. Returns the
+    payload that was serialized, without parsing the JSON back.
+    """
 
     conn = connection or get_redis_connection()
     ttl = ttl or settings.job_progress_ttl_seconds
-    serialized = _serialize_snapshot(job_id, snapshot)
+    payload, serialized = _serialize_snapshot(job_id, snapshot)
     key = PROGRESS_KEY_TEMPLATE.format(job_id=job_id)
-    conn.setex(key, ttl, serialized)
-    conn.publish(PROGRESS_CHANNEL, serialized)
-    record_progress_snapshot(snapshot.get("state", "unknown"))
+    pipe = pipeline if pipeline is not None else conn.pipeline(transaction=False)
+    pipe.setex(key, ttl, serialized)
+    pipe.publish(PROGRESS_CHANNEL, serialized)
     if "duration" in snapshot:
         try:
             from apps.api.services.progress_pubsub import record_job_duration
-            record_job_duration(float(snapshot["duration"]), connection=conn)
+            record_job_duration(float(snapshot["duration"]), connection=conn, pipeline=pipe)
         except (TypeError, ValueError):
             pass
-    return json.loads(serialized)
+    if pipeline is None:
+        pipe.execute()
+    record_progress_snapshot(snapshot.get("state", "unknown"))
+    return payload
@@ -727,20 +727,19 @@ def _apply_ledger_transformations(df: pd.DataFrame) -> pd.DataFrame:
     transformed_df = df.copy()
     
     try:
-        # Common ledger transformations
-        for col in transformed_df.columns:
-            # Convert numeric columns
-            if transformed_df[col].dtype == 'object':
-                # Try to convert to numeric, keeping original if fails
-                numeric_series = pd.to_numeric(transformed_df[col], errors='coerce')
-                if not numeric_series.isna().all():
-                    transformed_df[col] = numeric_series
+        # Convert numeric columns: coerce all object columns in one pass and
+        # keep the original wherever nothing parsed as a number
+        object_positions = [i for i, dtype in enumerate(transformed_df.dtypes) if dtype == 'object']
+        if object_positions:
+            coerced = transformed_df.iloc[:, object_positions].apply(pd.to_numeric, errors='coerce')
+            has_numbers = coerced.notna().any().to_numpy()
+            for offset, position in enumerate(object_positions):
+                if has_numbers[offset]:
+                    transformed_df.isetitem(position, coerced.iloc[:, offset])
         
-        # Remove completely empty rows
-        transformed_df = transformed_df.dropna(how='all')
-        
-        # Remove completely empty columns
-        transformed_df = transformed_df.dropna(axis=1, how='all')
+        # Remove completely empty rows and columns from a single NA mask
+        present = transformed_df.notna().to_numpy()
+        transformed_df = transformed_df.iloc[present.any(axis=1), present.any(axis=0)]
         
         # Standardize column names (remove extra whitespace, etc.)
         transformed_df.columns = [str(col).strip() for col in transformed_df.columns]
@@ -0,0 +1,72 @@
+"""Store processing status and event type as SMALLINT codes"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20240910_enum_columns_to_smallint"
+down_revision = "20240905_add_document_hash_columns"
+branch_labels = None
+depends_on = None
+
+# SQLAlchemy's Enum type persisted member names; the codes mirror
+# PROCESSING_STATUS_CODES / EVENT_TYPE_CODES in app.models.
+PROCESSING_STATUS_CODES = {
+    "UPLOADED": 1,
+    "PROCESSING": 2,
+    "COMPLETED": 3,
+    "FAILED": 4,
+    "RETRYING": 5,
+}
+
+EVENT_TYPE_CODES = {
+    "DOCUMENT_UPLOADED": 1,
+    "PROCESSING_STARTED": 2,
+    "PROCESSING_COMPLETED": 3,
+    "PROCESSING_FAILED": 4,
+    "EXTRACTION_COMPLETED": 5,
+    "MANUAL_REVIEW_STARTED": 6,
+}
+
+COLUMNS = (
+    ("documents", "processing_status", "processingstatus", PROCESSING_STATUS_CODES),
+    ("processing_events", "event_type", "eventtype", EVENT_TYPE_CODES),
+)
+
+
+def _to_code(column: str, codes: dict) -> str:
+    whens = " ".join(f"WHEN '{name}' THEN {code}" for name, code in codes.items())
+    return f"(CASE {column}::text {whens} END)::smallint"
+
+
+def _to_label(column: str, codes: dict, enum_name: str) -> str:
+    whens = " ".join(f"WHEN {code} THEN '{name}'" for name, code in codes.items())
+    return f"(CASE {column} {whens} END)::{enum_name}"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table, column, enum_name, codes in COLUMNS:
+        if bind.dialect.name == "postgresql":
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE SMALLINT "
+                f"USING {_to_code(column, codes)}"
+            )
+            op.execute(f"DROP TYPE IF EXISTS {enum_name}")
+        else:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, type_=sa.SmallInteger())
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table, column, enum_name, codes in COLUMNS:
+        if bind.dialect.name == "postgresql":
+            labels = ", ".join(f"'{name}'" for name in codes)
+            op.execute(f"CREATE TYPE {enum_name} AS ENUM ({labels})")
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} "
+                f"USING {_to_label(column, codes, enum_name)}"
+            )
+        else:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, type_=sa.Enum(*codes, name=enum_name))
@@ -0,0 +1,30 @@
+"""T3: Partial index for pending cost records
+
+Revision ID: t3_002
+Revises: t3_001
+Create Date: 2024-01-20 10:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers
+revision = 't3_002'
+down_revision = 't3_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cost status updates only ever touch PENDING rows for a job; a partial
+    # index keeps that lookup off the completed/failed history
+    op.create_index(
+        'idx_cost_records_pending',
+        'cost_records',
+        ['job_id'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_cost_records_pending', table_name='cost_records')
@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import math
 import time
 from typing import AsyncGenerator, Dict, Optional
 
+import orjson
 from fastapi import Request
 from fastapi.responses import StreamingResponse
 
@@ -19,13 +19,21 @@ DURATION_WINDOW = 200
 KEEPALIVE_INTERVAL = 15
 
 
-def record_job_duration(duration_seconds: float, *, connection=None) -> None:
-    """Persist job durations for adaptive fallback hints."""
+def record_job_duration(duration_seconds: float, *, connection=None, pipeline=None) -> None:
+    """Persist job durations for adaptive fallback hints.
+
+    With ``pipeline`` the commands are only queued; the caller executes it.
+    """
 
-    conn = connection or get_redis_connection()
     try:
-        conn.lpush(DURATION_KEY, duration_seconds)
-        conn.ltrim(DURATION_KEY, 0, DURATION_WINDOW - 1)
+        if pipeline is not None:
+            pipe = pipeline
+        else:
+            pipe = (connection or get_redis_connection()).pipeline(transaction=False)
+        pipe.lpush(DURATION_KEY, duration_seconds)
+        pipe.ltrim(DURATION_KEY, 0, DURATION_WINDOW - 1)
+        if pipeline is None:
+            pipe.execute()
     except Exception:  # pragma: no cover - defensive logging happens at caller
         pass
 
@@ -51,7 +59,7 @@ def estimate_p95_ms(*, connection=None) -> int:
 
 
 def _format_event(event: str, payload: Dict[str, object]) -> str:
-    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+    return f"event: {event}\ndata: {orjson.dumps(payload, default=str).decode()}\n\n"
 
 
 def _format_comment(message: str) -> str:
@@ -61,11 +69,11 @@ def _format_comment(message: str) -> str:
 def _deserialize_snapshot(raw) -> Optional[Dict[str, object]]:
     if not raw:
         return None
-    if isinstance(raw, bytes):
-        raw = raw.decode("utf-8")
+    # Every subscriber decodes every job's updates on the shared channel, so
+    # parse the bytes directly rather than decoding to str first
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return None
 
 
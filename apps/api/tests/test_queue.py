@@ -2,19 +2,34 @@ import json
 from types import SimpleNamespace
 
 import pytest
-from fastapi.testclient import TestClient
-
-from apps.api.app.jobs import JobPayload, SCHEMA_VERSION, JOB_VERSION
+from apps.api.app.jobs import JOB_VERSION, SCHEMA_VERSION, JobPayload
 from apps.api.app.main import app
 from apps.api.app.progress import PROGRESS_KEY_TEMPLATE, write_progress_snapshot
 from apps.api.config import settings as api_settings
 from apps.api.metrics import (
-    JOB_ENQUEUED,
     JOB_ENQUEUE_FAILURES,
+    JOB_ENQUEUED,
     JOB_PROGRESS_UPDATES,
     record_enqueue,
     record_enqueue_failure,
 )
+from fastapi.testclient import TestClient
+
+
+class InMemoryPipeline:
+    def __init__(self, redis: "InMemoryRedis"):
+        self._redis = redis
+        self._calls: list = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
 
 
 class InMemoryRedis:
@@ -23,8 +38,8 @@ class InMemoryRedis:
         self.published: list[tuple[str, str]] = []
         self._flags: set[str] = set()
 
-    def setex(self, key: str, _ttl: int, value: str) -> None:
-        self._store[key] = value.encode()
+    def setex(self, key: str, _ttl: int, value) -> None:
+        self._store[key] = value if isinstance(value, bytes) else value.encode()
 
     def publish(self, channel: str, message: str) -> None:
         self.published.append((channel, message))
@@ -32,6 +47,9 @@ class InMemoryRedis:
     def get(self, key: str):
         return self._store.get(key)
 
+    def pipeline(self, transaction: bool = True) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
     def exists(self, key: str) -> bool:
         return key in self._flags
 
@@ -1,9 +1,21 @@
 """Prometheus metrics helpers for worker service."""
 from __future__ import annotations
 
+import os
 from typing import Optional
 
-from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Coarse buckets keep the per-process histogram files and the scrape payload small
+JOB_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
 
 # Queue metrics
 QUEUE_ENQUEUED = Counter(
@@ -28,25 +40,28 @@ JOB_DURATION_SECONDS = Histogram(
     "ledger_lift_job_duration_seconds",
     "Observed job execution durations",
     ["queue", "result"],
+    buckets=JOB_DURATION_BUCKETS,
 )
 
 QUEUE_DEPTH = Gauge(
     "ledger_lift_queue_depth",
     "Number of jobs waiting in the queue",
     ["queue"],
+    multiprocess_mode="mostrecent",
 )
 
 WORKERS_BUSY = Gauge(
     "ledger_lift_workers_busy",
     "Number of workers busy per queue",
     ["queue"],
+    multiprocess_mode="mostrecent",
 )
 
 
-def record_enqueue(queue_name: str, priority: str) -> None:
+def record_enqueue(queue_name: str, priority: str, count: int = 1) -> None:
     """Increment job enqueue counter."""
 
-    QUEUE_ENQUEUED.labels(queue=queue_name, priority=priority).inc()
+    QUEUE_ENQUEUED.labels(queue=queue_name, priority=priority).inc(count)
 
 
 def record_retry_scheduled(queue_name: str) -> None:
@@ -77,3 +92,17 @@ def update_workers_busy(queue_name: str, count: int) -> None:
     """Update busy worker gauge."""
 
     WORKERS_BUSY.labels(queue=queue_name).set(count)
+
+
+def render_latest() -> bytes:
+    """Serialize metrics, merging every worker process when multiprocess mode is on.
+
+    RQ forks a work horse per job, so with ``PROMETHEUS_MULTIPROC_DIR`` set the
+    samples live in per-pid files that only ``MultiProcessCollector`` can see.
+    """
+
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
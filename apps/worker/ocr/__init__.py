@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import os
 import time
 from dataclasses import dataclass
 from typing import List
@@ -220,7 +221,16 @@ def _make_provider(config: WorkerConfig, provider: str) -> OCRProvider:
     if provider == "tesseract":
         from .tesseract_local import TesseractLocalOCRProvider
 
-        return TesseractLocalOCRProvider()
+        cache = None
+        if config.ocr_cache_ttl_seconds > 0:
+            from apps.worker.infra.redis import get_redis_connection
+
+            cache = get_redis_connection()
+        return TesseractLocalOCRProvider(
+            max_workers=config.ocr_tesseract_workers or os.cpu_count() or 1,
+            cache=cache,
+            cache_ttl_seconds=config.ocr_cache_ttl_seconds,
+        )
 
     raise OCRConfigurationError(f"Unsupported OCR provider: {provider}")
 
@@ -45,11 +45,12 @@ class AWSTextractOCRProvider:
         if not region:
             raise OCRConfigurationError("AWS_TEXTRACT_REGION is required")
         self._region = region
-        self._session = session or boto3.Session(
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key,
-            region_name=region,
-        )
+        if session is None:
+            from apps.worker.worker.aws_client import get_boto3_session
+
+            # Share the worker's session so credentials resolve once per process
+            session = get_boto3_session(access_key, secret_key)
+        self._session = session
         self._base_config = Config(retries={"max_attempts": 2})
 
     def extract_cells(
@@ -63,7 +64,7 @@ class AWSTextractOCRProvider:
         client_config = self._base_config.merge(
             Config(read_timeout=timeout_seconds, connect_timeout=timeout_seconds)
         )
-        client = self._session.client("textract", config=client_config)
+        client = self._session.client("textract", region_name=self._region, config=client_config)
 
         with open(document_path, "rb") as document_file:
             payload = document_file.read()
@@ -3,14 +3,46 @@ from __future__ import annotations
 
 import logging
 import time
+from functools import lru_cache
 from typing import Dict, List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from . import OCRCell, OCRRateLimitError, OCRTimeoutError, _parse_numeric_hint
 
 logger = logging.getLogger(__name__)
 
+# Fail fast when the endpoint is unreachable; the read budget comes from the caller
+_CONNECT_TIMEOUT_SECONDS = 3.05
+
+
+@lru_cache(maxsize=1)
+def _shared_session() -> requests.Session:
+    """Return the process-wide session so providers reuse keep-alive connections."""
+
+    # Connection failures are retried for every call, gateway errors only for
+    # the idempotent status polls (urllib3 never status-retries a POST), and
+    # throttling (429) is surfaced to the caller's rate limiter instead.
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=3,
+            status_forcelist=(502, 503, 504),
+            backoff_factor=0.2,
+            raise_on_status=False,
+        ),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class AzureLayoutOCRProvider:
     """OCR provider backed by Azure Document Intelligence Layout model."""
@@ -24,7 +56,7 @@ class AzureLayoutOCRProvider:
             raise ValueError("api_key is required")
         self._endpoint = endpoint.rstrip("/")
         self._api_key = api_key
-        self._session = session or requests.Session()
+        self._session = session or _shared_session()
 
     def extract_cells(
         self,
@@ -45,7 +77,7 @@ class AzureLayoutOCRProvider:
                 "Content-Type": "application/pdf",
             },
             data=payload,
-            timeout=timeout_seconds,
+            timeout=(_CONNECT_TIMEOUT_SECONDS, timeout_seconds),
         )
         if response.status_code == 429:
             retry_after = _safe_retry_after(response.headers)
@@ -87,16 +119,16 @@ class AzureLayoutOCRProvider:
         return cells
 
     def _poll_operation(self, url: str, timeout_seconds: float) -> Dict:
-        deadline = time.time() + timeout_seconds
+        deadline = time.monotonic() + timeout_seconds
         backoff = 1.0
         while True:
-            remaining = deadline - time.time()
+            remaining = deadline - time.monotonic()
             if remaining <= 0:
                 raise OCRTimeoutError("Azure Document Intelligence operation timed out")
             response = self._session.get(
                 url,
                 headers={"Ocp-Apim-Subscription-Key": self._api_key},
-                timeout=min(backoff, max(0.1, remaining)),
+                timeout=(_CONNECT_TIMEOUT_SECONDS, min(backoff, max(0.1, remaining))),
             )
             if response.status_code == 429:
                 retry_after = _safe_retry_after(response.headers)
@@ -108,7 +140,7 @@ class AzureLayoutOCRProvider:
                 return data
             if status == "failed":
                 raise RuntimeError("Azure Document Intelligence analysis failed")
-            sleep_for = min(backoff, max(0.1, deadline - time.time()))
+            sleep_for = min(backoff, max(0.1, deadline - time.monotonic()))
             if sleep_for <= 0:
                 raise OCRTimeoutError("Azure Document Intelligence operation timed out")
             time.sleep(sleep_for)
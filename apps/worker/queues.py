@@ -4,12 +4,11 @@ from __future__ import annotations
 import json
 import random
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional, Sequence
+from typing import Any, Callable, Iterable, Optional, Sequence
 
 try:
-    from rq import Queue
+    from rq import Queue, Retry
     from rq.job import Job
-    from rq.retry import Retry
     from rq.registry import (
         DeferredJobRegistry,
         FailedJobRegistry,
@@ -73,7 +72,7 @@ except ImportError:  # pragma: no cover
             kwargs=None,
             job_id: str | None = None,
             retry=None,
-            failure_callback=None,
+            on_failure=None,
             meta=None,
             description=None,
             result_ttl=None,
@@ -88,6 +87,37 @@ except ImportError:  # pragma: no cover
             )
             self._jobs.append(job)
             return job
+
+        @staticmethod
+        def prepare_data(
+            func,
+            args=(),
+            kwargs=None,
+            timeout=None,
+            result_ttl=None,
+            description=None,
+            job_id=None,
+            meta=None,
+            retry=None,
+            on_failure=None,
+            **_ignored,
+        ):
+            return dict(func=func, args=args, kwargs=kwargs, job_id=job_id, meta=meta)
+
+        def enqueue_many(self, job_datas, pipeline=None):
+            jobs = []
+            for data in job_datas:
+                job = Job(
+                    job_id=data["job_id"] or "stub-job",
+                    origin=self.name,
+                    connection=self.connection,
+                    meta=data["meta"],
+                    args=data["args"],
+                    kwargs=data["kwargs"],
+                )
+                self._jobs.append(job)
+                jobs.append(job)
+            return jobs
             
         def count(self) -> int:
             return len(self._jobs)
@@ -208,8 +238,17 @@ def _serialize_dead_letter(job: Job, exc_type: Optional[type], exc_value: Option
     return json.dumps(payload, default=str)
 
 
-def _dead_letter_callback(job: Job, exc_type: Optional[type], exc_value: Optional[BaseException], _traceback: Any):
-    """Route the job to a dead letter sink once retries are exhausted."""
+def _dead_letter_callback(
+    job: Job,
+    connection: Any,
+    exc_type: Optional[type],
+    exc_value: Optional[BaseException],
+    _traceback: Any,
+):
+    """Route the job to a dead letter sink once retries are exhausted.
+
+    RQ invokes failure callbacks as ``(job, connection, exc_type, exc_value, traceback)``.
+    """
 
     # RQ stores retries_left attribute when using Retry helper.
     if getattr(job, "retries_left", 0) > 0:
@@ -217,21 +256,84 @@ def _dead_letter_callback(job: Job, exc_type: Optional[type], exc_value: Optiona
         record_retry_scheduled(job.origin or settings.rq_default_queue)
         return
 
-    if is_emergency_stopped(job.connection):
+    if is_emergency_stopped(connection):
         # If emergency stop triggered mid-flight, we still mark as DLQ for visibility.
         record_retry_scheduled(job.origin or settings.rq_default_queue)
 
     serialized = _serialize_dead_letter(job, exc_type, exc_value)
-    job.connection.hset(f"deadletter:{settings.rq_dlq}", job.id, serialized)
+    connection.hset(f"deadletter:{settings.rq_dlq}", job.id, serialized)
     job.meta["dead_letter"] = True
     job.save_meta()
     record_dead_letter(job.origin or settings.rq_default_queue)
     try:
-        record_queue_state(Queue(job.origin, connection=job.connection))
+        record_queue_state(Queue(job.origin, connection=connection))
     except Exception:  # pragma: no cover - defensive safety when queue can't be instantiated
         pass
 
 
+def _build_retry(max_retries: Optional[int]) -> Retry:
+    retry_count = settings.redis_max_retries if max_retries is None else max_retries
+    return Retry(max=retry_count, interval=compute_backoff_intervals(retry_count))
+
+
+def _build_meta(metadata: Optional[dict[str, Any]]) -> dict[str, Any]:
+    meta = {
+        "version": metadata.get("version") if metadata else 1,
+        "schema_version": metadata.get("schema_version") if metadata else 1,
+    }
+    if metadata:
+        meta.update(metadata)
+    return meta
+
+
+def make_enqueuer(
+    func: Any,
+    *,
+    priority: str = "default",
+    max_retries: Optional[int] = None,
+    connection=None,
+    job_timeout: Optional[int] = None,
+) -> Callable[..., Job]:
+    """Return an ``enqueue`` callable bound to one function and queue.
+
+    The queue lookup and retry count are resolved once, so callers submitting
+    many jobs for the same function and priority skip that work per job.
+    """
+
+    connection = connection or get_redis_connection()
+    queue = get_queue(priority, connection=connection, job_timeout=job_timeout)
+    retry_count = settings.redis_max_retries if max_retries is None else max_retries
+
+    def enqueue(
+        *,
+        args: Optional[Iterable[Any]] = None,
+        kwargs: Optional[dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        description: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> Job:
+        if is_emergency_stopped(connection):
+            raise RuntimeError("Emergency stop is active; refusing to enqueue work.")
+
+        job = queue.enqueue(
+            func,
+            args=tuple(args or ()),
+            kwargs=dict(kwargs or {}),
+            job_id=job_id,
+            # Fresh Retry per job so each gets its own jitter
+            retry=_build_retry(retry_count),
+            on_failure=_dead_letter_callback,
+            meta=_build_meta(metadata),
+            description=description,
+            result_ttl=0,
+        )
+        record_enqueue(queue.name, priority)
+        record_queue_state(queue)
+        return job
+
+    return enqueue
+
+
 def enqueue_with_retry(
     func: Any,
     *,
@@ -247,8 +349,33 @@ def enqueue_with_retry(
 ) -> Job:
     """Enqueue a job with retry/backoff and DLQ routing."""
 
-    args = list(args or [])
-    kwargs = dict(kwargs or {})
+    enqueue = make_enqueuer(
+        func,
+        priority=priority,
+        max_retries=max_retries,
+        connection=connection,
+        job_timeout=job_timeout,
+    )
+    return enqueue(
+        args=args, kwargs=kwargs, job_id=job_id, description=description, metadata=metadata
+    )
+
+
+def enqueue_many_with_retry(
+    func: Any,
+    payloads: Iterable[dict[str, Any]],
+    *,
+    priority: str = "default",
+    max_retries: Optional[int] = None,
+    connection=None,
+    job_timeout: Optional[int] = None,
+) -> list[Job]:
+    """Enqueue several jobs in one Redis round-trip with retry/backoff and DLQ routing.
+
+    Each payload may carry ``args``, ``kwargs``, ``job_id``, ``description`` and
+    ``metadata`` keys, matching the keyword arguments of :func:`enqueue_with_retry`.
+    """
+
     connection = connection or get_redis_connection()
 
     if is_emergency_stopped(connection):
@@ -256,28 +383,29 @@ def enqueue_with_retry(
 
     queue = get_queue(priority, connection=connection, job_timeout=job_timeout)
 
-    retry_count = settings.redis_max_retries if max_retries is None else max_retries
-    intervals = compute_backoff_intervals(retry_count)
-    retry = Retry(max=retry_count, interval=intervals)
-
-    meta = {
-        "version": metadata.get("version") if metadata else 1,
-        "schema_version": metadata.get("schema_version") if metadata else 1,
-    }
-    if metadata:
-        meta.update(metadata)
-
-    job = queue.enqueue(
-        func,
-        args=tuple(args),
-        kwargs=kwargs,
-        job_id=job_id,
-        retry=retry,
-        failure_callback=_dead_letter_callback,
-        meta=meta,
-        description=description,
-        result_ttl=0,
-    )
-    record_enqueue(queue.name, priority)
+    job_datas = [
+        Queue.prepare_data(
+            func,
+            args=tuple(payload.get("args") or ()),
+            kwargs=dict(payload.get("kwargs") or {}),
+            timeout=job_timeout,
+            result_ttl=0,
+            description=payload.get("description"),
+            job_id=payload.get("job_id"),
+            meta=_build_meta(payload.get("metadata")),
+            # Separate Retry per job so each gets its own jitter
+            retry=_build_retry(max_retries),
+            on_failure=_dead_letter_callback,
+        )
+        for payload in payloads
+    ]
+    if not job_datas:
+        return []
+
+    pipe = connection.pipeline(transaction=False)
+    jobs = queue.enqueue_many(job_datas, pipeline=pipe)
+    pipe.execute()
+
+    record_enqueue(queue.name, priority, count=len(jobs))
     record_queue_state(queue)
-    return job
+    return jobs
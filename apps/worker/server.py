@@ -4,9 +4,10 @@ from __future__ import annotations
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.responses import Response
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from apps.worker.config import settings
+from apps.worker.metrics import render_latest
 
 app = FastAPI(title="Ledger Lift Worker Monitor", version="0.1.0")
 basic_auth = HTTPBasic(auto_error=False)
@@ -37,4 +38,4 @@ def metrics(credentials: HTTPBasicCredentials = Depends(basic_auth)) -> Response
                 headers={"WWW-Authenticate": "Basic"},
             )
 
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
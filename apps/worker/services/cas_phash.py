@@ -61,16 +61,16 @@ def ensure_phash_support() -> None:
 
 
 def _render_page(doc: fitz.Document, page_index: int) -> Optional["PILImageType"]:
-    """Render a PDF page to a Pillow image."""
+    """Render a PDF page to a grayscale Pillow image."""
 
     try:
         page = doc.load_page(page_index)
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-        mode = "RGBA" if pix.alpha else "RGB"
-        image = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-        if mode == "RGBA":
-            image = image.convert("RGB")
-        return image
+        # pHash works on luminance only, so render single-channel and skip both
+        # the RGB pixmap and phash's own convert("L") pass
+        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY, alpha=False)
+        # samples_mv exposes the pixmap buffer without the bytes copy that
+        # ``samples`` makes; frombytes copies it into the image anyway
+        return Image.frombytes("L", [pix.width, pix.height], pix.samples_mv)
     except Exception as exc:  # pragma: no cover - defensive guard for corrupt pages
         logger.warning("Failed to render page %s for pHash: %s", page_index, exc)
         return None
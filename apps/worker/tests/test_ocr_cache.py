@@ -0,0 +1,114 @@
+"""Tests for the Tesseract page-image OCR cache."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+import pytest
+from apps.worker.ocr import tesseract_local
+from apps.worker.ocr.tesseract_local import TesseractLocalOCRProvider
+
+fakeredis = pytest.importorskip("fakeredis")
+PIL_Image = pytest.importorskip("PIL.Image")
+fitz = pytest.importorskip("fitz")
+
+
+def _write_pdf(path: Path, pages: int) -> str:
+    document = fitz.open()
+    for _ in range(pages):
+        page = document.new_page()
+        page.insert_text((72, 72), "Revenue\t100")
+    document.save(path.as_posix())
+    document.close()
+    return path.as_posix()
+
+
+@pytest.fixture(autouse=True)
+def _pillow(monkeypatch) -> None:
+    monkeypatch.setattr(tesseract_local, "Image", PIL_Image)
+    monkeypatch.setattr(tesseract_local, "TESSEROCR_AVAILABLE", False)
+
+
+def test_identical_pages_are_ocr_once(tmp_path, monkeypatch) -> None:
+    calls: list[object] = []
+
+    def fake_image_to_string(image, lang):
+        calls.append(image)
+        return "Revenue\t100\n"
+
+    monkeypatch.setattr(
+        tesseract_local, "pytesseract", SimpleNamespace(image_to_string=fake_image_to_string)
+    )
+    cache = fakeredis.FakeStrictRedis()
+    provider = TesseractLocalOCRProvider(cache=cache, cache_ttl_seconds=60)
+
+    cold = provider.extract_cells(
+        _write_pdf(tmp_path / "one.pdf", pages=1), max_pages=None, timeout_ms=None
+    )
+    assert len(calls) == 1
+
+    # Every page renders to the same image as the cold page, so all three are
+    # served from the single cache entry without running OCR again.
+    warm = provider.extract_cells(
+        _write_pdf(tmp_path / "three.pdf", pages=3), max_pages=None, timeout_ms=None
+    )
+    assert len(calls) == 1
+    assert len(cache.keys("ocr_cache:tesseract:eng:*")) == 1
+    assert {cell.page for cell in warm} == {1, 2, 3}
+    assert [cell for cell in warm if cell.page == 1] == cold
+
+
+def test_cache_disabled_without_ttl(tmp_path, monkeypatch) -> None:
+    calls: list[object] = []
+    monkeypatch.setattr(
+        tesseract_local,
+        "pytesseract",
+        SimpleNamespace(
+            image_to_string=lambda image, lang: calls.append(image) or "Revenue\t100\n"
+        ),
+    )
+    cache = fakeredis.FakeStrictRedis()
+    provider = TesseractLocalOCRProvider(cache=cache, cache_ttl_seconds=0)
+    pdf_path = _write_pdf(tmp_path / "doc.pdf", pages=2)
+
+    provider.extract_cells(pdf_path, max_pages=None, timeout_ms=None)
+    provider.extract_cells(pdf_path, max_pages=None, timeout_ms=None)
+
+    assert len(calls) == 4
+    assert cache.keys("ocr_cache:*") == []
+
+
+def test_tesserocr_engine_reused_across_pages(tmp_path, monkeypatch) -> None:
+    engines: list[object] = []
+
+    class FakeAPI:
+        def __init__(self, lang):
+            self.pages = 0
+            self.ended = False
+            engines.append(self)
+
+        def SetImageBytes(self, data, width, height, bytes_per_pixel, bytes_per_line):
+            assert len(data) == width * height * bytes_per_pixel
+            self.pages += 1
+
+        def GetUTF8Text(self):
+            return "Revenue\t100\n"
+
+        def End(self):
+            self.ended = True
+
+    monkeypatch.setitem(sys.modules, "tesserocr", SimpleNamespace(PyTessBaseAPI=FakeAPI))
+    monkeypatch.setattr(tesseract_local, "TESSEROCR_AVAILABLE", True)
+    monkeypatch.setattr(tesseract_local, "pytesseract", None)
+    provider = TesseractLocalOCRProvider(max_workers=1)
+    pdf_path = _write_pdf(tmp_path / "doc.pdf", pages=3)
+
+    cells = provider.extract_cells(pdf_path, max_pages=None, timeout_ms=None)
+
+    assert len(engines) == 1
+    assert engines[0].pages == 3
+    assert engines[0].ended
+    assert {cell.page for cell in cells} == {1, 2, 3}
@@ -1,7 +1,15 @@
 import random
 
+import pytest
 from apps.worker.metrics import DEAD_LETTER_TOTAL, QUEUE_DEPTH, WORKERS_BUSY
-from apps.worker.queues import JobRegistries, compute_backoff_intervals, enqueue_with_retry
+from apps.worker.queues import (
+    JobRegistries,
+    _dead_letter_callback,
+    compute_backoff_intervals,
+    enqueue_many_with_retry,
+    enqueue_with_retry,
+    make_enqueuer,
+)
 
 
 def _metric_value(metric, **labels):
@@ -31,7 +39,9 @@ class DummyConnection:
 
 
 class DummyJob:
-    def __init__(self, job_id: str, origin: str, connection: DummyConnection, retries_left: int = 0):
+    def __init__(
+        self, job_id: str, origin: str, connection: DummyConnection, retries_left: int = 0
+    ):
         self.id = job_id
         self.origin = origin
         self.connection = connection
@@ -69,18 +79,29 @@ def test_enqueue_failure_moves_to_dead_letter_and_records_metrics(monkeypatch):
             self.enqueued = None
             self.jobs = []
 
-        def enqueue(self, func, args=(), kwargs=None, job_id=None, retry=None, failure_callback=None, meta=None, description=None, result_ttl=None):
+        def enqueue(
+            self,
+            func,
+            args=(),
+            kwargs=None,
+            job_id=None,
+            retry=None,
+            on_failure=None,
+            meta=None,
+            description=None,
+            result_ttl=None,
+        ):
             self.enqueued = {
                 "func": func,
                 "kwargs": kwargs or {},
                 "retry": retry,
-                "failure_callback": failure_callback,
+                "on_failure": on_failure,
                 "meta": meta or {},
             }
             job = DummyJob(job_id or "job-id", self.name, connection)
             self.jobs.append(job)
             # Simulate immediate failure and invoke callback
-            failure_callback(job, ValueError, ValueError("boom"), None)
+            on_failure(job, connection, ValueError, ValueError("boom"), None)
             return job
 
         def count(self) -> int:
@@ -89,7 +110,10 @@ def test_enqueue_failure_moves_to_dead_letter_and_records_metrics(monkeypatch):
     monkeypatch.setattr("apps.worker.queues.Queue", DummyQueue)
     monkeypatch.setattr("apps.worker.queues.get_redis_connection", lambda: connection)
     monkeypatch.setattr("apps.worker.queues.is_emergency_stopped", lambda *_: False)
-    monkeypatch.setattr("apps.worker.queues.get_job_registries", lambda name, connection=None: _registries())
+    monkeypatch.setattr(
+        "apps.worker.queues.get_job_registries",
+        lambda name, connection=None: _registries(),
+    )
 
     before_dead = _metric_value(DEAD_LETTER_TOTAL, queue="default")
 
@@ -110,7 +134,18 @@ def test_enqueue_updates_queue_depth_and_worker_gauge(monkeypatch):
             self.default_timeout = default_timeout
             self.jobs: list[DummyJob] = []
 
-        def enqueue(self, func, args=(), kwargs=None, job_id=None, retry=None, failure_callback=None, meta=None, description=None, result_ttl=None):
+        def enqueue(
+            self,
+            func,
+            args=(),
+            kwargs=None,
+            job_id=None,
+            retry=None,
+            on_failure=None,
+            meta=None,
+            description=None,
+            result_ttl=None,
+        ):
             job = DummyJob(job_id or "job-id", self.name, connection)
             self.jobs.append(job)
             return job
@@ -121,9 +156,143 @@ def test_enqueue_updates_queue_depth_and_worker_gauge(monkeypatch):
     monkeypatch.setattr("apps.worker.queues.Queue", SuccessfulQueue)
     monkeypatch.setattr("apps.worker.queues.get_redis_connection", lambda: connection)
     monkeypatch.setattr("apps.worker.queues.is_emergency_stopped", lambda *_: False)
-    monkeypatch.setattr("apps.worker.queues.get_job_registries", lambda name, connection=None: _registries(started=3))
+    monkeypatch.setattr(
+        "apps.worker.queues.get_job_registries",
+        lambda name, connection=None: _registries(started=3),
+    )
 
     enqueue_with_retry(lambda: None, priority="high", max_retries=1)
 
     assert _metric_value(QUEUE_DEPTH, queue="high") == 1
     assert _metric_value(WORKERS_BUSY, queue="high") == 3
+
+
+def test_enqueue_many_uses_single_pipeline(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    connection = fakeredis.FakeStrictRedis()
+    pipelines = []
+    original_pipeline = connection.pipeline
+
+    def tracking_pipeline(*args, **kwargs):
+        pipe = original_pipeline(*args, **kwargs)
+        pipelines.append(pipe)
+        return pipe
+
+    monkeypatch.setattr(connection, "pipeline", tracking_pipeline)
+    monkeypatch.setattr("apps.worker.queues.is_emergency_stopped", lambda *_: False)
+
+    payloads = [
+        {
+            "kwargs": {"document_id": f"doc-{i}"},
+            "job_id": f"job-{i}",
+            "metadata": {"document_id": f"doc-{i}"},
+        }
+        for i in range(3)
+    ]
+    jobs = enqueue_many_with_retry(
+        "worker.jobs.process_document_job",
+        payloads,
+        priority="low",
+        max_retries=2,
+        connection=connection,
+    )
+
+    assert [job.id for job in jobs] == ["job-0", "job-1", "job-2"]
+    assert len(pipelines) == 1
+    assert all(job.meta["document_id"] == f"doc-{i}" for i, job in enumerate(jobs))
+    assert all(job.retries_left == 2 for job in jobs)
+    assert _metric_value(QUEUE_DEPTH, queue="low") == 3
+
+
+def test_enqueue_many_failure_callback_moves_to_dead_letter(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    from rq.job import Job
+    from rq.timeouts import TimerDeathPenalty
+
+    connection = fakeredis.FakeStrictRedis()
+    monkeypatch.setattr("apps.worker.queues.is_emergency_stopped", lambda *_: False)
+
+    payloads = [{"kwargs": {"document_id": "doc-0"}, "job_id": "job-0"}]
+    enqueue_many_with_retry(
+        "worker.jobs.process_document_job",
+        payloads,
+        priority="low",
+        max_retries=1,
+        connection=connection,
+    )
+
+    before_dead = _metric_value(DEAD_LETTER_TOTAL, queue="low")
+    job = Job.fetch("job-0", connection=connection)
+    job.retries_left = 0
+    # Invoke the stored callback the way an RQ worker does after the last attempt
+    job.execute_failure_callback(TimerDeathPenalty, ValueError, ValueError("boom"), None)
+
+    assert connection.hget("deadletter:dead", "job-0")
+    assert Job.fetch("job-0", connection=connection).meta["dead_letter"] is True
+    assert _metric_value(DEAD_LETTER_TOTAL, queue="low") == before_dead + 1
+
+
+def test_enqueue_with_retry_stores_failure_callback(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    from rq.job import Job
+
+    connection = fakeredis.FakeStrictRedis()
+    monkeypatch.setattr("apps.worker.queues.is_emergency_stopped", lambda *_: False)
+
+    enqueue_with_retry(
+        "worker.jobs.process_document_job",
+        kwargs={"document_id": "doc-0"},
+        job_id="job-0",
+        max_retries=1,
+        connection=connection,
+    )
+
+    assert Job.fetch("job-0", connection=connection).failure_callback is _dead_letter_callback
+
+
+def test_make_enqueuer_resolves_queue_once(monkeypatch):
+    connection = DummyConnection()
+    created = []
+
+    class CountingQueue:
+        def __init__(self, name: str, connection=None, default_timeout=None):
+            self.name = name
+            self.connection = connection
+            self.jobs: list[DummyJob] = []
+            created.append(self)
+
+        def enqueue(
+            self,
+            func,
+            args=(),
+            kwargs=None,
+            job_id=None,
+            retry=None,
+            on_failure=None,
+            meta=None,
+            description=None,
+            result_ttl=None,
+        ):
+            job = DummyJob(job_id or "job-id", self.name, connection)
+            job.kwargs = kwargs or {}
+            self.jobs.append(job)
+            return job
+
+        def count(self) -> int:
+            return len(self.jobs)
+
+    monkeypatch.setattr("apps.worker.queues.Queue", CountingQueue)
+    monkeypatch.setattr("apps.worker.queues.is_emergency_stopped", lambda *_: False)
+    monkeypatch.setattr(
+        "apps.worker.queues.get_job_registries",
+        lambda name, connection=None: _registries(),
+    )
+
+    enqueue = make_enqueuer(
+        "worker.jobs.process_document_job", priority="low", max_retries=1, connection=connection
+    )
+    jobs = [enqueue(kwargs={"document_id": f"doc-{i}"}, job_id=f"job-{i}") for i in range(3)]
+
+    assert len(created) == 1
+    assert [job.kwargs["document_id"] for job in jobs] == ["doc-0", "doc-1", "doc-2"]
+    assert _metric_value(QUEUE_DEPTH, queue="low") == 3
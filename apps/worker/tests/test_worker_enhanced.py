@@ -2,19 +2,48 @@
 Enhanced test suite for worker modules with comprehensive error handling and mocking.
 Tests circuit breaker, retries, timeouts, and resource management.
 """
+import logging
 import pytest
+import re
+import statistics
 import time
 import json
 import tempfile
 import os
-from unittest.mock import Mock, patch, MagicMock, call
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, MagicMock, call, create_autospec
 from botocore.exceptions import ClientError, BotoCoreError
 
-from worker.aws_client import WorkerS3Client, CircuitBreaker
+from worker.aws_client import WorkerS3Client, CircuitBreaker, CircuitBreakerOpenError, reset_clients
+from worker.database import WorkerDatabase
 from worker.services import DocumentProcessor, ResourceManager, TimeoutError, ProcessingError
 from worker.models import ProcessingStatus, EventType
 
+_VALID_PDF = b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\ntest content'
+_INVALID_PDF = b'not a pdf'
+
+_RE_EMPTY_KEY = re.compile(r"S3 key cannot be empty")
+_RE_EMPTY_DATA = re.compile(r"Data cannot be empty")
+_RE_EMPTY_CONTENT_TYPE = re.compile(r"Content type cannot be empty")
+_RE_CIRCUIT_OPEN = re.compile(r"circuit breaker is open")
+_RE_EMPTY_DOC_ID = re.compile(r"Document ID cannot be empty")
+_RE_DOC_NOT_FOUND = re.compile(r"Document not found")
+_RE_INVALID_PDF = re.compile(r"not a valid PDF")
+_RE_EMPTY_DOWNLOAD = re.compile(r"Downloaded file is empty")
+_RE_S3_UNHEALTHY = re.compile(r"S3 unhealthy")
+_RE_PDF_TOO_LARGE = re.compile(r"PDF too large")
+_RE_TIMED_OUT = re.compile(r"timed out")
+_RE_NO_PREVIEWS = re.compile(r"No previews were successfully uploaded")
+
+
+@pytest.fixture(autouse=True)
+def _silence_logs():
+    """Skip log formatting on the error paths these tests exercise heavily."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
 
 class TestCircuitBreaker:
     """Test circuit breaker functionality."""
@@ -90,6 +119,16 @@ class TestCircuitBreaker:
         assert cb.state == 'open'
         assert cb.can_execute() is False
 
+    def test_circuit_breaker_concurrent_failures(self):
+        """Test concurrent failures are all counted and trip the breaker."""
+        cb = CircuitBreaker(failure_threshold=50, recovery_timeout=60)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: cb.record_failure(), range(200)))
+        
+        assert cb.failure_count == 200
+        assert cb.state == 'open'
+
 
 class TestWorkerS3Client:
     """Test enhanced worker S3 client."""
@@ -97,9 +136,10 @@ class TestWorkerS3Client:
     @pytest.fixture
     def s3_client(self):
         """Create S3 client with mocked boto3."""
-        with patch('worker.aws_client.boto3.client') as mock_boto3:
+        reset_clients()
+        with patch('worker.aws_client.boto3.Session') as mock_session:
             mock_client = Mock()
-            mock_boto3.return_value = mock_client
+            mock_session.return_value.client.return_value = mock_client
             
             # Mock successful bucket access verification
             mock_client.head_bucket.return_value = {}
@@ -116,9 +156,7 @@ class TestWorkerS3Client:
 
     def test_download_file_success(self, s3_client):
         """Test successful file download."""
-        mock_response = {'Body': Mock()}
-        mock_response['Body'].read.return_value = b'test content'
-        s3_client.client.get_object.return_value = mock_response
+        s3_client.client.get_object.return_value = _s3_response(b'test content')
         
         result = s3_client.download_file('test/file.pdf')
         
@@ -132,40 +170,35 @@ class TestWorkerS3Client:
 
     def test_download_file_validation(self, s3_client):
         """Test download file input validation."""
-        with pytest.raises(ValueError, match="S3 key cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_KEY):
             s3_client.download_file("")
         
-        with pytest.raises(ValueError, match="S3 key cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_KEY):
             s3_client.download_file("   ")
         
-        with pytest.raises(ValueError, match="S3 key cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_KEY):
             s3_client.download_file(None)
 
-    def test_download_file_with_retry(self, s3_client):
-        """Test download file with retry on transient failure."""
-        mock_response = {'Body': Mock()}
-        mock_response['Body'].read.return_value = b'test content'
+    def test_download_file_leaves_retries_to_botocore(self, s3_client):
+        """Test download errors surface after a single client call."""
+        # botocore's adaptive retry mode retries inside the client call itself
+        s3_client.client.get_object.side_effect = ClientError({'Error': {'Code': '500'}}, 'GetObject')
         
-        # First call fails, second succeeds
-        s3_client.client.get_object.side_effect = [
-            ClientError({'Error': {'Code': '500'}}, 'GetObject'),
-            mock_response
-        ]
-        
-        with patch('time.sleep'):  # Speed up test
-            result = s3_client.download_file('test/file.pdf')
+        with pytest.raises(ClientError):
+            s3_client.download_file('test/file.pdf')
         
-        assert result == b'test content'
-        assert s3_client.client.get_object.call_count == 2
-        assert s3_client._operation_stats['successful_operations'] == 1
+        assert s3_client.client.get_object.call_count == 1
+        assert s3_client._operation_stats['failed_operations'] == 1
 
     def test_download_file_circuit_breaker_open(self, s3_client):
         """Test download file when circuit breaker is open."""
         # Open the circuit breaker
         s3_client._circuit_breaker.state = 'open'
+        s3_client._circuit_breaker.last_failure_time = time.time()
         
-        with pytest.raises(Exception, match="circuit breaker is open"):
+        with pytest.raises(CircuitBreakerOpenError, match=_RE_CIRCUIT_OPEN):
             s3_client.download_file('test/file.pdf')
+        s3_client.client.get_object.assert_not_called()
 
     def test_upload_file_success(self, s3_client):
         """Test successful file upload."""
@@ -177,22 +210,30 @@ class TestWorkerS3Client:
             Bucket='ledger-lift',
             Key='test/file.pdf',
             Body=b'test content',
-            ContentType='application/pdf',
-            ServerSideEncryption=None
+            ContentType='application/pdf'
         )
         assert s3_client._operation_stats['successful_operations'] == 1
 
     def test_upload_file_validation(self, s3_client):
         """Test upload file input validation."""
-        with pytest.raises(ValueError, match="S3 key cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_KEY):
             s3_client.upload_file("", b'data', 'application/pdf')
         
-        with pytest.raises(ValueError, match="Data cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_DATA):
             s3_client.upload_file("key", b'', 'application/pdf')
         
-        with pytest.raises(ValueError, match="Content type cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_CONTENT_TYPE):
             s3_client.upload_file("key", b'data', "")
 
+    def test_bulkheads_are_shared_between_clients(self, s3_client):
+        """Test clients sharing a connection pool also share the bulkhead limits."""
+        with patch('worker.aws_client.boto3.Session'):
+            other = WorkerS3Client()
+
+        assert other._download_sem is s3_client._download_sem
+        assert other._upload_sem is s3_client._upload_sem
+        assert other._download_sem is not other._upload_sem
+
     def test_file_exists_true(self, s3_client):
         """Test file exists check when file exists."""
         s3_client.client.head_object.return_value = {}
@@ -258,9 +299,7 @@ class TestWorkerS3Client:
     def test_operation_stats_tracking(self, s3_client):
         """Test that operation statistics are tracked correctly."""
         # Successful operation
-        mock_response = {'Body': Mock()}
-        mock_response['Body'].read.return_value = b'test'
-        s3_client.client.get_object.return_value = mock_response
+        s3_client.client.get_object.return_value = _s3_response(b'test')
         
         s3_client.download_file('test.pdf')
         
@@ -281,12 +320,34 @@ class TestWorkerS3Client:
         assert stats['operation_stats']['successful_operations'] == 1
         assert stats['operation_stats']['failed_operations'] == 1
 
+    def test_response_time_mean_and_stddev(self, s3_client):
+        """Test running response time statistics match the sample mean/stddev."""
+        samples = [0.1, 0.2, 0.4, 0.8]
+        for sample in samples:
+            s3_client._record_operation(success=True, elapsed_ns=int(sample * 1e9))
+        
+        stats = s3_client.get_stats()['operation_stats']
+        assert stats['avg_response_time'] == pytest.approx(statistics.mean(samples))
+        assert stats['response_time_stddev'] == pytest.approx(statistics.stdev(samples))
+
+    def test_concurrent_operations_are_all_counted(self, s3_client):
+        """Test stats recorded from several threads lose no updates."""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(
+                lambda _: s3_client._record_operation(success=True, elapsed_ns=1000),
+                range(400)
+            ))
+        
+        stats = s3_client.get_stats()['operation_stats']
+        assert stats['total_operations'] == 400
+        assert stats['successful_operations'] == 400
+        assert stats['avg_response_time'] == pytest.approx(1e-6)
+        assert stats['response_time_stddev'] == 0
+
     def test_reset_stats(self, s3_client):
         """Test statistics reset functionality."""
         # Generate some stats
-        mock_response = {'Body': Mock()}
-        mock_response['Body'].read.return_value = b'test'
-        s3_client.client.get_object.return_value = mock_response
+        s3_client.client.get_object.return_value = _s3_response(b'test')
         s3_client.download_file('test.pdf')
         
         # Reset stats
@@ -378,8 +439,8 @@ class TestDocumentProcessor:
         with patch('worker.services.WorkerDatabase') as mock_db_class, \
              patch('worker.services.WorkerS3Client') as mock_s3_class:
             
-            mock_db = Mock()
-            mock_s3 = Mock()
+            mock_db = create_autospec(WorkerDatabase, instance=True)
+            mock_s3 = create_autospec(WorkerS3Client, instance=True)
             mock_db_class.return_value = mock_db
             mock_s3_class.return_value = mock_s3
             
@@ -398,41 +459,34 @@ class TestDocumentProcessor:
         doc.original_filename = 'test.pdf'
         return doc
 
+    @pytest.fixture
+    def happy_path_processor(self, processor, mock_document):
+        """Processor whose document lookup, S3 health and download all succeed."""
+        processor.db.get_document.return_value = mock_document
+        processor.s3.health_check.return_value = {'status': 'healthy'}
+        processor.s3.download_file.return_value = _VALID_PDF
+        return processor
+
     def test_process_document_validation(self, processor):
         """Test document processing input validation."""
-        with pytest.raises(ValueError, match="Document ID cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_DOC_ID):
             processor.process_document("")
         
-        with pytest.raises(ValueError, match="Document ID cannot be empty"):
+        with pytest.raises(ValueError, match=_RE_EMPTY_DOC_ID):
             processor.process_document("   ")
 
-    def test_process_document_success(self, processor, mock_document):
+    def test_process_document_success(self, happy_path_processor, tmp_path):
         """Test successful document processing."""
-        # Setup mocks
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        processor.s3.download_file.return_value = b'%PDF-1.4\ntest pdf content'
-        
         with patch('worker.services.render_pdf_preview') as mock_render, \
-             patch('worker.services.extract_tables_stub') as mock_extract, \
-             patch('builtins.open', mock_open()):
+             patch('worker.services.extract_tables_stub') as mock_extract:
+            
+            # Render to real preview files so exists()/stat()/open() need no patching
+            mock_render.return_value = _write_previews(tmp_path, 2)
             
-            # Mock preview rendering
-            mock_preview_paths = [Path('/tmp/preview1.png'), Path('/tmp/preview2.png')]
-            mock_render.return_value = mock_preview_paths
+            # Mock table extraction
+            mock_extract.return_value = [{'table': 1}, {'table': 2}]
             
-            # Mock preview file existence and reading
-            with patch.object(Path, 'exists', return_value=True), \
-                 patch.object(Path, 'stat') as mock_stat:
-                
-                mock_stat.return_value.st_size = 1024
-                
-                # Mock table extraction
-                mock_extract.return_value = [{'table': 1}, {'table': 2}]
-                
-                # Mock file reading for previews
-                with patch('builtins.open', mock_open(read_data=b'png data')):
-                    result = processor.process_document('doc-123', timeout_seconds=60)
+            result = happy_path_processor.process_document('doc-123', timeout_seconds=60)
         
         # Verify successful processing
         assert result['success'] is True
@@ -442,144 +496,100 @@ class TestDocumentProcessor:
         assert len(result['stages_completed']) > 0
         
         # Verify database calls
-        processor.db.update_document_status.assert_any_call('doc-123', ProcessingStatus.PROCESSING)
-        processor.db.update_document_status.assert_any_call('doc-123', ProcessingStatus.COMPLETED)
-        processor.db.create_page.assert_called()
+        happy_path_processor.db.update_document_status.assert_any_call('doc-123', ProcessingStatus.PROCESSING)
+        happy_path_processor.db.update_document_status.assert_any_call('doc-123', ProcessingStatus.COMPLETED)
+        happy_path_processor.db.create_page.assert_called()
 
     def test_process_document_not_found(self, processor):
         """Test processing when document is not found."""
         processor.db.get_document.return_value = None
         
-        with pytest.raises(ProcessingError, match="Document not found"):
+        with pytest.raises(ProcessingError, match=_RE_DOC_NOT_FOUND):
             processor.process_document('nonexistent-doc')
 
-    def test_process_document_invalid_pdf(self, processor, mock_document):
+    def test_process_document_invalid_pdf(self, happy_path_processor):
         """Test processing with invalid PDF content."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        processor.s3.download_file.return_value = b'not a pdf'  # Invalid PDF
+        happy_path_processor.s3.download_file.return_value = _INVALID_PDF
         
-        with pytest.raises(ProcessingError, match="not a valid PDF"):
-            processor.process_document('doc-123')
+        with pytest.raises(ProcessingError, match=_RE_INVALID_PDF):
+            happy_path_processor.process_document('doc-123')
 
-    def test_process_document_empty_pdf(self, processor, mock_document):
+    def test_process_document_empty_pdf(self, happy_path_processor):
         """Test processing with empty PDF content."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        processor.s3.download_file.return_value = b''  # Empty content
+        happy_path_processor.s3.download_file.return_value = b''  # Empty content
         
-        with pytest.raises(ProcessingError, match="Downloaded file is empty"):
-            processor.process_document('doc-123')
+        with pytest.raises(ProcessingError, match=_RE_EMPTY_DOWNLOAD):
+            happy_path_processor.process_document('doc-123')
 
-    def test_process_document_s3_unhealthy(self, processor, mock_document):
+    def test_process_document_s3_unhealthy(self, happy_path_processor):
         """Test processing when S3 is unhealthy."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {
+        happy_path_processor.s3.health_check.return_value = {
             'status': 'unhealthy', 
             'error': 'Connection timeout'
         }
         
-        with pytest.raises(ProcessingError, match="S3 unhealthy"):
-            processor.process_document('doc-123')
+        with pytest.raises(ProcessingError, match=_RE_S3_UNHEALTHY):
+            happy_path_processor.process_document('doc-123')
 
-    def test_process_document_pdf_too_large(self, processor, mock_document):
+    def test_process_document_pdf_too_large(self, happy_path_processor):
         """Test processing with PDF that's too large."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        
         # Create large PDF content (over default 100MB limit)
         large_pdf = b'%PDF-1.4\n' + b'x' * (101 * 1024 * 1024)
-        processor.s3.download_file.return_value = large_pdf
+        happy_path_processor.s3.download_file.return_value = large_pdf
         
-        with pytest.raises(ProcessingError, match="PDF too large"):
-            processor.process_document('doc-123')
+        with pytest.raises(ProcessingError, match=_RE_PDF_TOO_LARGE):
+            happy_path_processor.process_document('doc-123')
 
-    def test_process_document_render_timeout(self, processor, mock_document):
+    def test_process_document_render_timeout(self, happy_path_processor):
         """Test processing with PDF rendering timeout."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        processor.s3.download_file.return_value = b'%PDF-1.4\ntest content'
-        
         with patch('worker.services.render_pdf_preview') as mock_render, \
              patch('builtins.open', mock_open()):
             
-            # Mock timeout in render function
-            def slow_render(*args):
-                time.sleep(2)  # Simulate slow operation
-                return []
-            
-            mock_render.side_effect = slow_render
+            # Simulate the render exceeding its deadline without waiting on it
+            mock_render.side_effect = TimeoutError("render timed out")
             
-            with pytest.raises(ProcessingError, match="timed out"):
-                processor.process_document('doc-123', timeout_seconds=1)
+            with pytest.raises(ProcessingError, match=_RE_TIMED_OUT):
+                happy_path_processor.process_document('doc-123', timeout_seconds=1)
 
-    def test_process_document_preview_upload_failure(self, processor, mock_document):
+    def test_process_document_preview_upload_failure(self, happy_path_processor, tmp_path):
         """Test processing with preview upload failure."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        processor.s3.download_file.return_value = b'%PDF-1.4\ntest content'
-        
         with patch('worker.services.render_pdf_preview') as mock_render, \
-             patch('worker.services.extract_tables_stub') as mock_extract, \
-             patch('builtins.open', mock_open()):
+             patch('worker.services.extract_tables_stub') as mock_extract:
             
-            mock_preview_paths = [Path('/tmp/preview1.png')]
-            mock_render.return_value = mock_preview_paths
+            mock_render.return_value = _write_previews(tmp_path, 1)
             mock_extract.return_value = []
             
-            with patch.object(Path, 'exists', return_value=True), \
-                 patch.object(Path, 'stat') as mock_stat:
-                
-                mock_stat.return_value.st_size = 1024
-                
-                # Mock S3 upload failure
-                processor.s3.upload_file.side_effect = Exception("Upload failed")
-                
-                with patch('builtins.open', mock_open(read_data=b'png data')):
-                    with pytest.raises(ProcessingError, match="No previews were successfully uploaded"):
-                        processor.process_document('doc-123')
-
-    def test_process_document_graceful_table_extraction_failure(self, processor, mock_document):
+            # Mock S3 upload failure
+            happy_path_processor.s3.upload_file.side_effect = Exception("Upload failed")
+            
+            with pytest.raises(ProcessingError, match=_RE_NO_PREVIEWS):
+                happy_path_processor.process_document('doc-123')
+
+    def test_process_document_graceful_table_extraction_failure(self, happy_path_processor, tmp_path):
         """Test that table extraction failure doesn't stop processing."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        processor.s3.download_file.return_value = b'%PDF-1.4\ntest content'
-        
         with patch('worker.services.render_pdf_preview') as mock_render, \
-             patch('worker.services.extract_tables_stub') as mock_extract, \
-             patch('builtins.open', mock_open()):
+             patch('worker.services.extract_tables_stub') as mock_extract:
             
-            mock_preview_paths = [Path('/tmp/preview1.png')]
-            mock_render.return_value = mock_preview_paths
+            mock_render.return_value = _write_previews(tmp_path, 1)
             
             # Mock table extraction failure
             mock_extract.side_effect = Exception("Extraction failed")
             
-            with patch.object(Path, 'exists', return_value=True), \
-                 patch.object(Path, 'stat') as mock_stat:
-                
-                mock_stat.return_value.st_size = 1024
-                
-                with patch('builtins.open', mock_open(read_data=b'png data')):
-                    result = processor.process_document('doc-123')
+            result = happy_path_processor.process_document('doc-123')
         
         # Should still succeed despite table extraction failure
         assert result['success'] is True
         assert result['table_count'] == 0  # No tables extracted due to failure
 
-    def test_processing_stats_tracking(self, processor, mock_document):
+    def test_processing_stats_tracking(self, happy_path_processor):
         """Test that processing statistics are tracked correctly."""
-        processor.db.get_document.return_value = mock_document
-        processor.s3.health_check.return_value = {'status': 'healthy'}
-        processor.s3.download_file.return_value = b'%PDF-1.4\ntest content'
-        
         with patch('worker.services.render_pdf_preview', return_value=[]), \
              patch('worker.services.extract_tables_stub', return_value=[]), \
              patch('builtins.open', mock_open()):
             
-            processor.process_document('doc-123')
+            happy_path_processor.process_document('doc-123')
         
-        stats = processor.get_processing_stats()
+        stats = happy_path_processor.get_processing_stats()
         assert stats['processing_stats']['total_processed'] == 1
         assert stats['processing_stats']['successful_processed'] == 1
         assert stats['processing_stats']['failed_processed'] == 0
@@ -630,8 +640,8 @@ class TestIntegrationScenarios:
         with patch('worker.services.WorkerDatabase') as mock_db_class, \
              patch('worker.services.WorkerS3Client') as mock_s3_class:
             
-            mock_db = Mock()
-            mock_s3 = Mock()
+            mock_db = create_autospec(WorkerDatabase, instance=True)
+            mock_s3 = create_autospec(WorkerS3Client, instance=True)
             mock_db_class.return_value = mock_db
             mock_s3_class.return_value = mock_s3
             
@@ -641,7 +651,7 @@ class TestIntegrationScenarios:
             
             return processor
 
-    def test_end_to_end_processing_with_cleanup(self, full_processor):
+    def test_end_to_end_processing_with_cleanup(self, full_processor, tmp_path, monkeypatch):
         """Test end-to-end processing with proper resource cleanup."""
         # Setup document
         mock_doc = Mock()
@@ -651,45 +661,33 @@ class TestIntegrationScenarios:
         
         full_processor.db.get_document.return_value = mock_doc
         full_processor.s3.health_check.return_value = {'status': 'healthy'}
-        full_processor.s3.download_file.return_value = b'%PDF-1.4\ntest pdf content'
+        full_processor.s3.download_file.return_value = _VALID_PDF
         
-        # Track created temporary files
-        created_files = []
-        
-        def track_temp_file(*args, **kwargs):
-            fd, path = tempfile.mkstemp(*args, **kwargs)
-            os.close(fd)
-            created_files.append(path)
-            return path
+        # Route every temporary file into a directory we can inspect afterwards
+        scratch_dir = tmp_path / 'scratch'
+        scratch_dir.mkdir()
+        monkeypatch.setattr(tempfile, 'tempdir', str(scratch_dir))
         
         with patch('worker.services.render_pdf_preview') as mock_render, \
-             patch('worker.services.extract_tables_stub') as mock_extract, \
-             patch('tempfile.mkstemp', side_effect=track_temp_file):
+             patch('worker.services.extract_tables_stub') as mock_extract:
             
-            mock_preview_paths = [Path('/tmp/preview1.png'), Path('/tmp/preview2.png')]
-            mock_render.return_value = mock_preview_paths
+            mock_render.return_value = _write_previews(tmp_path, 2)
             mock_extract.return_value = []
             
-            with patch.object(Path, 'exists', return_value=True), \
-                 patch.object(Path, 'stat') as mock_stat, \
-                 patch('builtins.open', mock_open(read_data=b'png data')):
-                
-                mock_stat.return_value.st_size = 1024
-                
-                result = full_processor.process_document('doc-123')
+            result = full_processor.process_document('doc-123')
         
         # Verify processing succeeded
         assert result['success'] is True
         
         # Verify temporary files were cleaned up
-        for file_path in created_files:
-            assert not os.path.exists(file_path)
+        assert not any(scratch_dir.iterdir())
 
     def test_circuit_breaker_integration(self):
         """Test circuit breaker integration across multiple operations."""
-        with patch('worker.aws_client.boto3.client') as mock_boto3:
+        reset_clients()
+        with patch('worker.aws_client.boto3.Session') as mock_session:
             mock_client = Mock()
-            mock_boto3.return_value = mock_client
+            mock_session.return_value.client.return_value = mock_client
             mock_client.head_bucket.return_value = {}
             
             s3_client = WorkerS3Client()
@@ -700,17 +698,16 @@ class TestIntegrationScenarios:
                 {'Error': {'Code': '500'}}, 'GetObject'
             )
             
-            # First few failures should retry
-            for _ in range(3):
-                with pytest.raises(Exception):
-                    with patch('time.sleep'):  # Speed up test
-                        s3_client.download_file('test.pdf')
+            # Each failed operation counts towards the breaker threshold
+            for _ in range(s3_client._circuit_breaker.failure_threshold):
+                with pytest.raises(ClientError):
+                    s3_client.download_file('test.pdf')
             
             # After enough failures, circuit should open
             assert s3_client._circuit_breaker.state == 'open'
             
             # Next operation should be blocked immediately
-            with pytest.raises(Exception, match="circuit breaker is open"):
+            with pytest.raises(CircuitBreakerOpenError, match=_RE_CIRCUIT_OPEN):
                 s3_client.download_file('test2.pdf')
 
     def test_timeout_and_cleanup_integration(self, full_processor):
@@ -722,28 +719,42 @@ class TestIntegrationScenarios:
         
         full_processor.db.get_document.return_value = mock_doc
         full_processor.s3.health_check.return_value = {'status': 'healthy'}
-        full_processor.s3.download_file.return_value = b'%PDF-1.4\ntest content'
+        full_processor.s3.download_file.return_value = _VALID_PDF
         
         # Track created files
         created_files = []
         
-        def track_and_slow_render(path):
+        def track_and_timeout_render(path):
             # Track the temp file that was created
             created_files.append(path)
-            # Simulate slow operation that will timeout
-            time.sleep(2)
-            return []
+            # Simulate a render that exceeds its deadline
+            raise TimeoutError("render timed out")
         
-        with patch('worker.services.render_pdf_preview', side_effect=track_and_slow_render), \
+        with patch('worker.services.render_pdf_preview', side_effect=track_and_timeout_render), \
              patch('builtins.open', mock_open()):
             
-            with pytest.raises(ProcessingError, match="timed out"):
+            with pytest.raises(ProcessingError, match=_RE_TIMED_OUT):
                 full_processor.process_document('doc-123', timeout_seconds=1)
         
         # Verify that failure was logged properly
         full_processor.db.update_document_status.assert_called_with('doc-123', ProcessingStatus.FAILED)
 
 
+def _s3_response(data):
+    """Build a minimal get_object response whose Body yields ``data``."""
+    return {'Body': SimpleNamespace(read=lambda: data)}
+
+
+def _write_previews(directory, count):
+    """Write real preview images so file checks run against the filesystem."""
+    paths = []
+    for i in range(1, count + 1):
+        path = directory / f'preview{i}.png'
+        path.write_bytes(b'png data')
+        paths.append(path)
+    return paths
+
+
 def mock_open(read_data=b''):
     """Helper to create a mock for file operations."""
     mock_file = MagicMock()
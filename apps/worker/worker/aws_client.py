@@ -1,19 +1,112 @@
 """
-Enhanced S3 client for worker with circuit breaker, retries, timeouts, and comprehensive error handling.
+Enhanced S3 client for worker with circuit breaker, retries, timeouts, and
+comprehensive error handling.
+
+Retries are delegated to botocore (adaptive mode); the circuit breaker wraps
+each public operation so callers fail fast while S3 is known to be down.
 """
-import os
 import logging
+import math
+import os
+import threading
 import time
-from contextlib import contextmanager
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
 import boto3
 from botocore.config import Config
-from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def get_boto3_session(
+    aws_access_key_id: Optional[str] = None,
+    aws_secret_access_key: Optional[str] = None,
+) -> boto3.Session:
+    """
+    Return the process-wide boto3 Session for a set of credentials.
+    
+    Clients for every service (S3, Textract) are derived from it so the
+    credential provider chain and endpoint data are resolved once per process.
+    """
+    return boto3.Session(
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+    )
+
+@lru_cache(maxsize=None)
+def get_s3_client(
+    use_aws: bool,
+    endpoint_url: str,
+    aws_access_key_id: str,
+    aws_secret_access_key: str,
+    region: str,
+    max_pool_connections: int = 50,
+):
+    """
+    Return a process-wide boto3 S3 client for the given connection settings.
+
+    Building a client parses the endpoint and service models and opens a new
+    connection pool, so clients are created once per process and shared by
+    every WorkerS3Client (boto3 clients are thread-safe).
+    """
+    # Retries, backoff with jitter and client-side rate limiting are owned by
+    # botocore's adaptive mode; the circuit breaker only fails fast on top.
+    config = Config(
+        retries={
+            'mode': 'adaptive',
+            'total_max_attempts': 5
+        },
+        max_pool_connections=max_pool_connections,
+        region_name=region,
+        connect_timeout=30,
+        read_timeout=60,
+        parameter_validation=False
+    )
+
+    if use_aws:
+        return get_boto3_session().client('s3', config=config, region_name=region)
+    return get_boto3_session(aws_access_key_id, aws_secret_access_key).client(
+        's3',
+        endpoint_url=endpoint_url,
+        region_name=region,
+        config=config
+    )
+
+@lru_cache(maxsize=None)
+def get_bulkhead(operation: str, limit: int) -> threading.BoundedSemaphore:
+    """
+    Return the process-wide semaphore bounding in-flight S3 calls of one kind.
+    
+    Shared like the client's connection pool, so a burst of uploads from one
+    task cannot take every pooled connection away from downloads.
+    """
+    return threading.BoundedSemaphore(limit)
+
+def reset_clients():
+    """Drop cached boto3 sessions and clients so the next WorkerS3Client builds fresh ones."""
+    get_s3_client.cache_clear()
+    get_boto3_session.cache_clear()
+    get_bulkhead.cache_clear()
+
+def _normalize_key(key: Optional[str]) -> str:
+    """Strip an S3 key once up front, rejecting empty or blank keys."""
+    key = (key or '').strip()
+    if not key:
+        raise ValueError("S3 key cannot be empty")
+    return key
+
+class CircuitBreakerOpenError(Exception):
+    """Raised when an S3 operation is rejected because the circuit breaker is open."""
+    pass
+
 class CircuitBreaker:
-    """Circuit breaker for S3 operations to prevent cascade failures."""
+    """Circuit breaker for S3 operations to prevent cascade failures.
+    
+    Safe to share between threads: state transitions happen under a lock so
+    concurrent failures are all counted and the breaker trips at threshold.
+    """
     
     def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
         self.failure_threshold = failure_threshold
@@ -21,42 +114,52 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time = 0
         self.state = 'closed'  # closed, open, half-open
+        self._lock = threading.Lock()
     
     def can_execute(self) -> bool:
         """Check if operation can be executed based on circuit breaker state."""
+        # Lock-free fast path for the common case
         if self.state == 'closed':
             return True
-        elif self.state == 'open':
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = 'half-open'
-                return True
-            return False
-        else:  # half-open
-            return True
+        
+        with self._lock:
+            if self.state == 'open':
+                if time.time() - self.last_failure_time > self.recovery_timeout:
+                    self.state = 'half-open'
+                    return True
+                return False
+            return True  # closed or half-open
     
     def record_success(self):
         """Record successful operation."""
-        self.failure_count = 0
-        self.state = 'closed'
+        if self.state == 'closed' and self.failure_count == 0:
+            return
+        with self._lock:
+            self.failure_count = 0
+            self.state = 'closed'
     
     def record_failure(self):
         """Record failed operation."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = 'open'
-            logger.warning(f"Worker S3 circuit breaker opened after {self.failure_count} failures")
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+            
+            if self.failure_count >= self.failure_threshold:
+                self.state = 'open'
+                logger.warning(
+                    f"Worker S3 circuit breaker opened after {self.failure_count} failures"
+                )
     
     def get_status(self) -> Dict[str, Any]:
         """Get current circuit breaker status."""
-        return {
-            'state': self.state,
-            'failure_count': self.failure_count,
-            'last_failure_time': self.last_failure_time,
-            'failure_threshold': self.failure_threshold,
-            'recovery_timeout': self.recovery_timeout
-        }
+        with self._lock:
+            return {
+                'state': self.state,
+                'failure_count': self.failure_count,
+                'last_failure_time': self.last_failure_time,
+                'failure_threshold': self.failure_threshold,
+                'recovery_timeout': self.recovery_timeout
+            }
 
 class WorkerS3Client:
     """Enhanced S3 client for worker with circuit breaker, retries, and health monitoring."""
@@ -68,6 +171,18 @@ class WorkerS3Client:
         self.aws_access_key_id = os.getenv('AWS_ACCESS_KEY_ID', 'minioadmin')
         self.aws_secret_access_key = os.getenv('AWS_SECRET_ACCESS_KEY', 'minioadmin')
         self.aws_region = os.getenv('AWS_REGION', 'us-east-1')
+        # Must be >= the number of threads sharing the client (celery --concurrency),
+        # otherwise urllib3 discards pooled connections and re-handshakes.
+        self.max_pool_connections = int(os.getenv('S3_MAX_POOL_CONNECTIONS', '50'))
+        # Request SSE on AWS only; elsewhere the parameter is omitted, not sent as None
+        self._put_extra_args = {'ServerSideEncryption': 'AES256'} if self.use_aws else {}
+        
+        # Bulkheads: cap in-flight calls per operation type so neither can
+        # monopolize the shared connection pool
+        self._download_sem = get_bulkhead(
+            'download', int(os.getenv('S3_DOWNLOAD_CONCURRENCY', '24'))
+        )
+        self._upload_sem = get_bulkhead('upload', int(os.getenv('S3_UPLOAD_CONCURRENCY', '24')))
         
         # Circuit breaker for failure protection
         self._circuit_breaker = CircuitBreaker(
@@ -75,52 +190,41 @@ class WorkerS3Client:
             recovery_timeout=int(os.getenv('S3_RECOVERY_TIMEOUT', '60'))
         )
         
-        # Operation statistics
+        # Operation statistics; response time mean/stddev are derived from the
+        # integer nanosecond sums on read rather than on every operation. S3
+        # calls can come from several threads, so updates and reads share a lock
+        self._stats_lock = threading.Lock()
+        self._response_time_ns_total = 0
+        self._response_time_ns_sq_total = 0
         self._operation_stats = {
             'total_operations': 0,
             'successful_operations': 0,
             'failed_operations': 0,
-            'avg_response_time': 0,
             'last_operation_time': 0
         }
         
-        # Enhanced configuration with timeouts and retries
-        config = Config(
-            retries={
-                'max_attempts': 3,
-                'mode': 'adaptive',
-                'total_max_attempts': 5
-            },
-            max_pool_connections=50,
-            region_name=self.aws_region,
-            connect_timeout=30,
-            read_timeout=60,
-            parameter_validation=False
-        )
-        
         try:
-            if self.use_aws:
-                self.client = boto3.client('s3', config=config, region_name=self.aws_region)
-            else:
-                self.client = boto3.client(
-                    's3',
-                    endpoint_url=self.s3_endpoint,
-                    aws_access_key_id=self.aws_access_key_id,
-                    aws_secret_access_key=self.aws_secret_access_key,
-                    region_name=self.aws_region,
-                    config=config
-                )
+            self.client = get_s3_client(
+                self.use_aws,
+                self.s3_endpoint,
+                self.aws_access_key_id,
+                self.aws_secret_access_key,
+                self.aws_region,
+                self.max_pool_connections,
+            )
             
-            # Verify bucket access during initialization
-            self._verify_bucket_access()
+            # Permission problems surface on the first real call anyway, so the
+            # extra HeadBucket round-trip per construction is opt-in
+            if os.getenv('S3_VERIFY_BUCKET_ON_INIT', 'false').lower() == 'true':
+                self.verify_bucket_access()
             logger.info("Worker S3 client initialized successfully")
             
         except Exception as e:
             logger.error(f"Failed to initialize Worker S3 client: {e}")
             raise
     
-    def _verify_bucket_access(self):
-        """Verify bucket access during initialization."""
+    def verify_bucket_access(self):
+        """Verify the configured bucket is reachable with the current credentials."""
         try:
             self.client.head_bucket(Bucket=self.s3_bucket)
             logger.debug(f"Verified access to S3 bucket: {self.s3_bucket}")
@@ -131,153 +235,143 @@ class WorkerS3Client:
                 logger.error(f"S3 bucket access error: {e}")
                 raise
     
-    def _record_operation(self, success: bool, response_time: float):
+    def _record_operation(self, success: bool, elapsed_ns: int):
         """Record operation statistics."""
-        self._operation_stats['total_operations'] += 1
-        self._operation_stats['last_operation_time'] = time.time()
+        with self._stats_lock:
+            self._operation_stats['total_operations'] += 1
+            self._operation_stats['last_operation_time'] = time.time()
+            self._response_time_ns_total += elapsed_ns
+            self._response_time_ns_sq_total += elapsed_ns * elapsed_ns
+            if success:
+                self._operation_stats['successful_operations'] += 1
+            else:
+                self._operation_stats['failed_operations'] += 1
         
         if success:
-            self._operation_stats['successful_operations'] += 1
             self._circuit_breaker.record_success()
         else:
-            self._operation_stats['failed_operations'] += 1
             self._circuit_breaker.record_failure()
+    
+    def _snapshot_stats(self) -> Dict[str, Any]:
+        """Copy the operation counters and derive response time mean/stddev."""
+        with self._stats_lock:
+            stats = self._operation_stats.copy()
+            total_ns = self._response_time_ns_total
+            total_sq_ns = self._response_time_ns_sq_total
+        total_ops = stats['total_operations']
         
-        # Update average response time
-        total_ops = self._operation_stats['total_operations']
-        current_avg = self._operation_stats['avg_response_time']
-        self._operation_stats['avg_response_time'] = (
-            (current_avg * (total_ops - 1) + response_time) / total_ops
-        )
+        stats['avg_response_time'] = total_ns / total_ops / 1e9 if total_ops else 0
+        stats['response_time_stddev'] = 0
+        if total_ops > 1:
+            # Sums are exact integers, so this does not suffer the cancellation
+            # the naive float formula does
+            variance_ns = (total_ops * total_sq_ns - total_ns * total_ns) / (
+                total_ops * (total_ops - 1)
+            )
+            stats['response_time_stddev'] = math.sqrt(max(variance_ns, 0)) / 1e9
+        return stats
     
     def _execute_with_circuit_breaker(self, operation_name: str, operation_func):
         """Execute S3 operation with circuit breaker protection."""
         if not self._circuit_breaker.can_execute():
-            raise Exception(f"S3 circuit breaker is open - {operation_name} operation blocked")
+            raise CircuitBreakerOpenError(
+                f"S3 circuit breaker is open - {operation_name} operation blocked"
+            )
         
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         try:
             result = operation_func()
-            response_time = time.time() - start_time
-            self._record_operation(success=True, response_time=response_time)
-            
-            logger.debug(f"Worker S3 {operation_name} completed in {response_time:.3f}s")
-            return result
-            
         except Exception as e:
-            response_time = time.time() - start_time
-            self._record_operation(success=False, response_time=response_time)
+            elapsed_ns = time.monotonic_ns() - start_ns
+            self._record_operation(success=False, elapsed_ns=elapsed_ns)
             
-            logger.error(f"Worker S3 {operation_name} failed after {response_time:.3f}s: {e}")
+            logger.error("Worker S3 %s failed after %.3fs: %s", operation_name, elapsed_ns / 1e9, e)
             raise
-    
-    @contextmanager
-    def _retry_on_failure(self, max_retries: int = 3, backoff_factor: float = 1.0):
-        """Context manager for retrying operations with exponential backoff."""
-        last_exception = None
         
-        for attempt in range(max_retries):
-            try:
-                yield attempt
-                return  # Success, exit retry loop
-            except (BotoCoreError, ClientError) as e:
-                last_exception = e
-                if attempt < max_retries - 1:
-                    sleep_time = backoff_factor * (2 ** attempt)
-                    logger.warning(f"S3 operation failed (attempt {attempt + 1}/{max_retries}), retrying in {sleep_time}s: {e}")
-                    time.sleep(sleep_time)
-                    continue
-                break
-            except Exception as e:
-                # Don't retry on non-S3 errors
-                logger.error(f"Non-retryable error in S3 operation: {e}")
-                raise
+        elapsed_ns = time.monotonic_ns() - start_ns
+        self._record_operation(success=True, elapsed_ns=elapsed_ns)
         
-        logger.error(f"S3 operation failed after {max_retries} attempts")
-        raise last_exception
-
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Worker S3 %s completed in %.3fs", operation_name, elapsed_ns / 1e9)
+        return result
+    
     def download_file(self, key: str) -> bytes:
         """Download file from S3 with circuit breaker and retry protection."""
-        if not key or not key.strip():
-            raise ValueError("S3 key cannot be empty")
+        key = _normalize_key(key)
         
         def operation():
-            with self._retry_on_failure(max_retries=3, backoff_factor=1.0):
-                response = self.client.get_object(Bucket=self.s3_bucket, Key=key.strip())
+            with self._download_sem:
+                response = self.client.get_object(Bucket=self.s3_bucket, Key=key)
                 return response['Body'].read()
         
         return self._execute_with_circuit_breaker('download_file', operation)
     
     def upload_file(self, key: str, data: bytes, content_type: str) -> None:
         """Upload file to S3 with circuit breaker and retry protection."""
-        if not key or not key.strip():
-            raise ValueError("S3 key cannot be empty")
+        key = _normalize_key(key)
         if not data:
             raise ValueError("Data cannot be empty")
-        if not content_type or not content_type.strip():
+        content_type = (content_type or '').strip()
+        if not content_type:
             raise ValueError("Content type cannot be empty")
         
         def operation():
-            with self._retry_on_failure(max_retries=3, backoff_factor=1.0):
+            with self._upload_sem:
                 self.client.put_object(
                     Bucket=self.s3_bucket,
-                    Key=key.strip(),
+                    Key=key,
                     Body=data,
-                    ContentType=content_type.strip(),
-                    ServerSideEncryption='AES256' if self.use_aws else None
+                    ContentType=content_type,
+                    **self._put_extra_args
                 )
         
         return self._execute_with_circuit_breaker('upload_file', operation)
     
     def file_exists(self, key: str) -> bool:
         """Check if file exists in S3."""
-        if not key or not key.strip():
-            raise ValueError("S3 key cannot be empty")
+        key = _normalize_key(key)
         
         def operation():
-            with self._retry_on_failure(max_retries=2, backoff_factor=0.5):
-                try:
-                    self.client.head_object(Bucket=self.s3_bucket, Key=key.strip())
-                    return True
-                except ClientError as e:
-                    if e.response['Error']['Code'] == '404':
-                        return False
-                    raise
+            try:
+                self.client.head_object(Bucket=self.s3_bucket, Key=key)
+                return True
+            except ClientError as e:
+                if e.response['Error']['Code'] == '404':
+                    return False
+                raise
         
         return self._execute_with_circuit_breaker('file_exists', operation)
     
     def get_file_metadata(self, key: str) -> Dict[str, Any]:
         """Get file metadata from S3."""
-        if not key or not key.strip():
-            raise ValueError("S3 key cannot be empty")
+        key = _normalize_key(key)
         
         def operation():
-            with self._retry_on_failure(max_retries=2, backoff_factor=0.5):
-                response = self.client.head_object(Bucket=self.s3_bucket, Key=key.strip())
-                return {
-                    'size': response.get('ContentLength', 0),
-                    'last_modified': response.get('LastModified'),
-                    'content_type': response.get('ContentType'),
-                    'etag': response.get('ETag', '').strip('"')
-                }
+            response = self.client.head_object(Bucket=self.s3_bucket, Key=key)
+            return {
+                'size': response.get('ContentLength', 0),
+                'last_modified': response.get('LastModified'),
+                'content_type': response.get('ContentType'),
+                'etag': response.get('ETag', '').strip('"')
+            }
         
         return self._execute_with_circuit_breaker('get_file_metadata', operation)
     
     def health_check(self) -> Dict[str, Any]:
         """Comprehensive health check for worker S3 client."""
         try:
-            start_time = time.time()
+            start_ns = time.monotonic_ns()
             
             # Test basic connectivity and bucket access
             self.client.head_bucket(Bucket=self.s3_bucket)
             
-            health_time = time.time() - start_time
+            health_time = (time.monotonic_ns() - start_ns) / 1e9
             
             return {
                 'status': 'healthy',
                 'response_time_ms': round(health_time * 1000, 2),
                 'circuit_breaker': self._circuit_breaker.get_status(),
-                'operation_stats': self._operation_stats.copy(),
+                'operation_stats': self._snapshot_stats(),
                 'bucket': self.s3_bucket,
                 'endpoint': self.s3_endpoint if not self.use_aws else 'AWS S3',
                 'timestamp': time.time()
@@ -288,24 +382,26 @@ class WorkerS3Client:
                 'status': 'unhealthy',
                 'error': str(e),
                 'circuit_breaker': self._circuit_breaker.get_status(),
-                'operation_stats': self._operation_stats.copy(),
+                'operation_stats': self._snapshot_stats(),
                 'timestamp': time.time()
             }
     
     def get_stats(self) -> Dict[str, Any]:
         """Get S3 client statistics."""
         return {
-            'operation_stats': self._operation_stats.copy(),
+            'operation_stats': self._snapshot_stats(),
             'circuit_breaker': self._circuit_breaker.get_status()
         }
     
     def reset_stats(self):
         """Reset operation statistics."""
-        self._operation_stats = {
-            'total_operations': 0,
-            'successful_operations': 0,
-            'failed_operations': 0,
-            'avg_response_time': 0,
-            'last_operation_time': 0
-        }
+        with self._stats_lock:
+            self._operation_stats = {
+                'total_operations': 0,
+                'successful_operations': 0,
+                'failed_operations': 0,
+                'last_operation_time': 0
+            }
+            self._response_time_ns_total = 0
+            self._response_time_ns_sq_total = 0
         logger.info("Worker S3 client statistics reset")
\ No newline at end of file
@@ -1,19 +1,32 @@
 from apps.worker.worker.services import get_job, mark_job_cancelled
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
 log=logging.getLogger(__name__)
 
+# Checkpoints within this window of the last DB lookup reuse its result
+CHECK_TTL_SECONDS=0.25
+_last_checked: dict[str, float]={}
+
 class JobCancelledException(Exception):
     pass
 
 async def check_cancellation(job_id: str):
+    last=_last_checked.get(job_id)
+    if last is not None and time.monotonic() - last < CHECK_TTL_SECONDS:
+        return
     job=await get_job(job_id)
+    _last_checked[job_id]=time.monotonic()
     if job and job["cancellation_requested"]:
+        forget_job(job_id)
         await mark_job_cancelled(job_id)
         raise JobCancelledException(f"Job {job_id} was cancelled")
 
+def forget_job(job_id: str):
+    _last_checked.pop(job_id, None)
+
 @asynccontextmanager
 async def cancellation_checkpoint(job_id: str, message: str="checkpoint"):
     await check_cancellation(job_id)
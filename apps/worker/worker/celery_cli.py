@@ -3,15 +3,21 @@ Celery worker CLI for running document processing tasks.
 """
 import logging
 import sys
+from functools import lru_cache
 from typing import Optional
+
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from .tasks import celery_app, get_task_status, get_queue_stats, purge_queue
 
-console = Console()
+# Celery (via .tasks) and rich are imported inside the commands so loading
+# this CLI does not pull in the whole processing stack.
+
+@lru_cache(maxsize=1)
+def get_console():
+    """Shared rich console, created on first use."""
+    from rich.console import Console
+    
+    return Console()
+
 app = typer.Typer(help="Celery Worker CLI for Ledger Lift")
 
 @app.command()
@@ -25,6 +31,11 @@ def worker(
     without_heartbeat: bool = typer.Option(False, "--without-heartbeat", help="Disable heartbeat"),
 ):
     """Start a Celery worker."""
+    from rich.panel import Panel
+
+    from .tasks import celery_app
+    console = get_console()
+    
     console.print(Panel.fit(
         f"[bold blue]Starting Celery Worker[/bold blue]\n"
         f"Concurrency: {concurrency}\n"
@@ -68,6 +79,12 @@ def worker(
 @app.command()
 def status():
     """Show worker and queue status."""
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from .tasks import get_queue_stats
+    console = get_console()
+    
     console.print(Panel.fit("[bold blue]Worker Status[/bold blue]", title="Status Check"))
     
     try:
@@ -101,6 +118,11 @@ def status():
 @app.command()
 def task_status(task_id: str):
     """Get status of a specific task."""
+    from rich.panel import Panel
+
+    from .tasks import get_task_status
+    console = get_console()
+    
     console.print(f"[blue]Getting status for task: {task_id}[/blue]")
     
     try:
@@ -132,6 +154,9 @@ def purge(
     queue_name: str = typer.Option("document_processing", "--queue", "-q", help="Queue name to purge")
 ):
     """Purge all tasks from a queue."""
+    from .tasks import purge_queue
+    console = get_console()
+    
     console.print(f"[yellow]Purging queue: {queue_name}[/yellow]")
     
     try:
@@ -148,9 +173,38 @@ def purge(
 @app.command()
 def monitor():
     """Monitor worker activity in real-time."""
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from .tasks import celery_app, get_queue_stats
+    console = get_console()
+    
     console.print(Panel.fit("[bold blue]Worker Monitor[/bold blue]", title="Real-time Monitoring"))
     
+    def _count(tasks_by_worker):
+        return sum(len(tasks) for tasks in (tasks_by_worker or {}).values())
+    
     try:
+        # Workers do not send task events by default, so switch them on when a
+        # monitor attaches. They are left on at exit: turning them off would
+        # also cut off Flower or any other event consumer in the cluster.
+        celery_app.control.enable_events()
+        
+        # Seed the counts once; afterwards workers push task events to us
+        stats = get_queue_stats()
+        scheduled_ids = {
+            entry['request']['id']
+            for entries in (stats.get('scheduled_tasks') or {}).values()
+            for entry in entries
+        }
+        counts = {
+            'active': _count(stats.get('active_tasks')),
+            'scheduled': len(scheduled_ids),
+            'reserved': _count(stats.get('reserved_tasks')),
+            'succeeded': 0,
+            'failed': 0,
+        }
+        
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -158,21 +212,50 @@ def monitor():
         ) as progress:
             task = progress.add_task("Monitoring workers...", total=None)
             
-            while True:
-                stats = get_queue_stats()
-                
-                if 'error' not in stats:
-                    active_count = sum(len(tasks) for tasks in stats.get('active_tasks', {}).values())
-                    scheduled_count = sum(len(tasks) for tasks in stats.get('scheduled_tasks', {}).values())
-                    reserved_count = sum(len(tasks) for tasks in stats.get('reserved_tasks', {}).values())
-                    
-                    progress.update(
-                        task,
-                        description=f"Active: {active_count}, Scheduled: {scheduled_count}, Reserved: {reserved_count}"
-                    )
-                
-                import time
-                time.sleep(5)
+            def refresh():
+                progress.update(
+                    task,
+                    description=(
+                        f"Active: {counts['active']}, Scheduled: {counts['scheduled']}, "
+                        f"Reserved: {counts['reserved']}, Succeeded: {counts['succeeded']}, "
+                        f"Failed: {counts['failed']}"
+                    ),
+                )
+            
+            def on_received(event):
+                # Tasks with an ETA/countdown are held as scheduled, the rest are reserved
+                if event.get('eta'):
+                    scheduled_ids.add(event['uuid'])
+                    counts['scheduled'] += 1
+                else:
+                    counts['reserved'] += 1
+                refresh()
+            
+            def on_started(event):
+                if event['uuid'] in scheduled_ids:
+                    scheduled_ids.discard(event['uuid'])
+                    counts['scheduled'] = max(0, counts['scheduled'] - 1)
+                else:
+                    counts['reserved'] = max(0, counts['reserved'] - 1)
+                counts['active'] += 1
+                refresh()
+            
+            def on_finished(outcome):
+                def handler(event):
+                    counts['active'] = max(0, counts['active'] - 1)
+                    counts[outcome] += 1
+                    refresh()
+                return handler
+            
+            refresh()
+            with celery_app.connection() as connection:
+                receiver = celery_app.events.Receiver(connection, handlers={
+                    'task-received': on_received,
+                    'task-started': on_started,
+                    'task-succeeded': on_finished('succeeded'),
+                    'task-failed': on_finished('failed'),
+                })
+                receiver.capture(limit=None, timeout=None, wakeup=True)
                 
     except KeyboardInterrupt:
         console.print("\n[yellow]Monitoring stopped by user[/yellow]")
@@ -1,25 +1,33 @@
-import typer
-import tempfile
 import os
 import uuid
-from pathlib import Path
-from rich.console import Console
-from .database import WorkerDatabase
-from .pipeline.render import render_pdf_preview
-from .pipeline.extract import extract_tables_stub
-from .services import DocumentProcessor
+
+import typer
+
 from .celery_cli import app as celery_app
-from .tasks import process_document_task, batch_process_documents_task
+from .celery_cli import get_console
+
+# Rendering, extraction, database, Celery task and rich imports are deferred
+# to the commands that use them so `--help` and unrelated subcommands start quickly.
 
 app = typer.Typer(help="Ledger Lift worker CLI")
-console = Console()
 
 # Add Celery commands
 app.add_typer(celery_app, name="celery", help="Celery worker commands")
 
+def _pipeline_executor(max_workers: int):
+    """Process pool for CPU-bound pipeline steps; WORKER_PIPELINE_THREADS=true uses threads instead."""
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    
+    if os.getenv("WORKER_PIPELINE_THREADS", "false").lower() == "true":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ProcessPoolExecutor(max_workers=max_workers)
+
 @app.command("process-document")
 def process_document(doc_id: str):
     """Process document by ID from database"""
+    from .services import DocumentProcessor
+    console = get_console()
+    
     processor = DocumentProcessor()
     try:
         processor.process_document(doc_id)
@@ -31,14 +39,23 @@ def process_document(doc_id: str):
 @app.command("process-file")
 def process_file(pdf_path: str, doc_id: str = None):
     """Process local file (for testing)"""
+    from .pipeline.extract import extract_tables_stub
+    from .pipeline.render import render_pdf_preview
+    console = get_console()
+    
     if not doc_id:
         doc_id = f"test-{uuid.uuid4()}"
     
     console.log(f"[bold]Processing file[/] {pdf_path} as {doc_id}")
     try:
-        images = render_pdf_preview(pdf_path)
+        # Rendering and extraction read the PDF independently and are CPU-bound,
+        # so run them side by side in separate processes
+        with _pipeline_executor(max_workers=2) as executor:
+            images_future = executor.submit(render_pdf_preview, pdf_path)
+            tables_future = executor.submit(extract_tables_stub, pdf_path)
+            images = images_future.result()
+            tables = tables_future.result()
         console.log(f"Rendered {len(images)} preview image(s)")
-        tables = extract_tables_stub(pdf_path)
         console.log(f"Extracted {len(tables)} table(s) [stub]")
         console.log("[green]Done[/]")
     except Exception as e:
@@ -48,6 +65,9 @@ def process_file(pdf_path: str, doc_id: str = None):
 @app.command("list-documents")
 def list_documents():
     """List all documents in database"""
+    from .database import WorkerDatabase
+    console = get_console()
+    
     db = WorkerDatabase()
     # This would need a method in WorkerDatabase to list documents
     console.log("Document listing not yet implemented")
@@ -55,6 +75,9 @@ def list_documents():
 @app.command("queue-document")
 def queue_document(doc_id: str):
     """Queue a document for processing"""
+    from .tasks import process_document_task
+    console = get_console()
+    
     try:
         result = process_document_task.delay(doc_id)
         console.log(f"[green]Queued document {doc_id} for processing (task_id: {result.id})[/]")
@@ -63,12 +86,32 @@ def queue_document(doc_id: str):
         raise typer.Exit(1)
 
 @app.command("queue-batch")
-def queue_batch(doc_ids: str):
-    """Queue multiple documents for batch processing"""
+def queue_batch(
+    doc_ids: str = typer.Argument(
+        ..., help="Comma-separated document IDs, or '-' to read them from stdin"
+    ),
+):
+    """Queue multiple documents for processing"""
+    import sys
+
+    from celery import group
+
+    from .tasks import process_document_task
+    console = get_console()
+    
+    raw = sys.stdin.read() if doc_ids == "-" else doc_ids
+    doc_id_list = [doc_id.strip() for doc_id in raw.replace("\n", ",").split(",") if doc_id.strip()]
+    if not doc_id_list:
+        console.log("[red]No document IDs given[/]")
+        raise typer.Exit(1)
+    
     try:
-        doc_id_list = [doc_id.strip() for doc_id in doc_ids.split(',')]
-        result = batch_process_documents_task.delay(doc_id_list)
-        console.log(f"[green]Queued {len(doc_id_list)} documents for batch processing (task_id: {result.id})[/]")
+        # A group publishes every task over one producer connection instead of
+        # a broker round-trip per .delay()
+        result = group(process_document_task.s(doc_id) for doc_id in doc_id_list).apply_async()
+        console.log(
+            f"[green]Queued {len(doc_id_list)} documents for processing (group_id: {result.id})[/]"
+        )
     except Exception as e:
         console.log(f"[red]Failed to queue batch processing: {e}[/]")
         raise typer.Exit(1)
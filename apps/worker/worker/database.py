@@ -1,9 +1,17 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from apps.worker.worker.config import settings
+from apps.worker.config import settings
 import logging
 
 log=logging.getLogger(__name__)
-engine=create_async_engine(settings.database_url, echo=False, pool_pre_ping=True)
+# One engine (and pool) per process, shared by every session and task
+engine=create_async_engine(
+    settings.database_url,
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=1800,
+)
 async_session_factory=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 async def get_db_session():
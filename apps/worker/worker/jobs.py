@@ -6,10 +6,11 @@ import time
 from typing import Any, Dict
 
 from apps.worker.config import settings
-from apps.worker.infra.redis import get_redis_connection, is_emergency_stopped
+from apps.worker.infra.redis import get_redis_connection
 from apps.worker.metrics import observe_job_duration
 from apps.worker.queues import QueueNames
 from apps.worker.worker.services import DocumentProcessor, ProcessingError
+from rq import Worker
 
 try:
     from apps.api.app.progress import write_progress_snapshot
@@ -24,13 +25,78 @@ class RetryableJobError(Exception):
     """Raised when a job should be retried."""
 
 
+_PROCESSOR: DocumentProcessor | None = None
+
+
+def init_worker() -> DocumentProcessor:
+    """Build the shared DocumentProcessor once per worker process.
+
+    :class:`PreforkWorker` calls it before the worker starts taking jobs so
+    forked work horses inherit the instance; otherwise every job builds it.
+    """
+
+    global _PROCESSOR
+    if _PROCESSOR is None:
+        _PROCESSOR = DocumentProcessor()
+    return _PROCESSOR
+
+
+class PreforkWorker(Worker):
+    """RQ worker that builds the shared DocumentProcessor before forking.
+
+    A plain ``rq worker`` forks a fresh work horse per job, so a processor
+    built inside the job is discarded when the horse exits. Start workers with
+    ``--worker-class worker.jobs.PreforkWorker`` to build it in the parent.
+    """
+
+    def work(self, *args: Any, **kwargs: Any) -> bool:
+        init_worker()
+        return super().work(*args, **kwargs)
+
+
+def _accept_job(job_id: str, base_snapshot: Dict[str, Any], *, connection) -> None:
+    """Check the emergency stop and publish the processing snapshot in one round-trip."""
+
+    pipe = connection.pipeline(transaction=False)
+    pipe.exists(settings.emergency_stop_key)
+    write_progress_snapshot(
+        job_id, {"state": "processing", **base_snapshot}, connection=connection, pipeline=pipe
+    )
+    stopped = pipe.execute()[0]
+    if stopped:
+        # Rare path: take back the processing state that went out with the check
+        write_progress_snapshot(
+            job_id,
+            {"state": "failed", **base_snapshot, "error": "Emergency stop engaged"},
+            connection=connection,
+        )
+        raise RuntimeError("Emergency stop engaged")
+
+
+def _record_outcome(
+    job_id: str,
+    queue_name: str,
+    start_ns: int,
+    result: str,
+    snapshot: Dict[str, Any],
+    *,
+    connection,
+    publish_duration: bool = False,
+) -> float:
+    """Observe the job duration and publish the final progress snapshot."""
+
+    duration = (time.monotonic_ns() - start_ns) / 1e9
+    observe_job_duration(queue_name, duration, result=result)
+    if publish_duration:
+        snapshot["duration"] = duration
+    write_progress_snapshot(job_id, snapshot, connection=connection)
+    return duration
+
+
 def process_document_job(document_id: str, job_payload: Dict[str, Any]) -> Dict[str, Any]:
     """Process a document with retry semantics."""
 
     connection = get_redis_connection()
-    if is_emergency_stopped(connection):
-        raise RuntimeError("Emergency stop engaged")
-
     job_id = job_payload.get("job_id")
     priority = job_payload.get("priority", settings.rq_default_queue)
     queues = QueueNames()
@@ -39,33 +105,23 @@ def process_document_job(document_id: str, job_payload: Dict[str, Any]) -> Dict[
         "low": queues.low,
         "default": queues.default,
     }.get(priority, queues.default)
-    start_time = time.time()
+    start_ns = time.monotonic_ns()
+    base_snapshot = {"document_id": document_id, "priority": priority}
 
-    write_progress_snapshot(
-        job_id,
-        {
-            "state": "processing",
-            "document_id": document_id,
-            "priority": priority,
-        },
-        connection=connection,
-    )
+    _accept_job(job_id, base_snapshot, connection=connection)
 
-    processor = DocumentProcessor()
+    processor = init_worker()
     try:
         timeout_seconds = max(1, settings.parse_timeout_ms // 1000)
         result = processor.process_document(document_id, timeout_seconds=timeout_seconds)
-        duration = time.time() - start_time
-        observe_job_duration(queue_name, duration, result="success")
-        write_progress_snapshot(
+        duration = _record_outcome(
             job_id,
-            {
-                "state": "completed",
-                "document_id": document_id,
-                "priority": priority,
-                "duration": duration,
-            },
+            queue_name,
+            start_ns,
+            "success",
+            {"state": "completed", **base_snapshot},
             connection=connection,
+            publish_duration=True,
         )
         return {
             "document_id": document_id,
@@ -75,30 +131,22 @@ def process_document_job(document_id: str, job_payload: Dict[str, Any]) -> Dict[
         }
     except ProcessingError as exc:
         # Processing errors should be retried based on RQ Retry policy.
-        duration = time.time() - start_time
-        observe_job_duration(queue_name, duration, result="retry")
-        write_progress_snapshot(
+        _record_outcome(
             job_id,
-            {
-                "state": "retrying",
-                "document_id": document_id,
-                "priority": priority,
-                "error": str(exc),
-            },
+            queue_name,
+            start_ns,
+            "retry",
+            {"state": "retrying", **base_snapshot, "error": str(exc)},
             connection=connection,
         )
         raise RetryableJobError(str(exc)) from exc
     except Exception as exc:  # pragma: no cover - defensive
-        duration = time.time() - start_time
-        observe_job_duration(queue_name, duration, result="failed")
-        write_progress_snapshot(
+        _record_outcome(
             job_id,
-            {
-                "state": "failed",
-                "document_id": document_id,
-                "priority": priority,
-                "error": str(exc),
-            },
+            queue_name,
+            start_ns,
+            "failed",
+            {"state": "failed", **base_snapshot, "error": str(exc)},
             connection=connection,
         )
         raise
@@ -1,21 +1,44 @@
+from __future__ import annotations
+
 import logging
 import time
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from pathlib import Path
-import pandas as pd
 
 from apps.worker.config import settings
 
-try:
-    import camelot
-    import pdfplumber
-    EXTRACTION_AVAILABLE = True
-except ImportError as e:
-    logging.warning(f"PDF extraction libraries not available: {e}")
-    EXTRACTION_AVAILABLE = False
+if TYPE_CHECKING:
+    import pandas as pd
+
+# camelot, pdfplumber and pandas pull in pdfminer, Ghostscript bindings and
+# the pandas extensions; they are imported on the first extraction so jobs
+# that never extract tables do not pay for them at worker start
+camelot = None
+pdfplumber = None
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def extraction_available() -> bool:
+    """Import the table extraction libraries once and report whether they loaded."""
+    global camelot, pdfplumber
+    try:
+        import camelot as camelot_module
+        import pdfplumber as pdfplumber_module
+    except ImportError as e:
+        logging.warning(f"PDF extraction libraries not available: {e}")
+        return False
+    camelot, pdfplumber = camelot_module, pdfplumber_module
+    return True
+
+# Camelot re-opens the file on every call, so pages are read a few at a time
+# rather than one by one
+_CAMELOT_BATCH_PAGES = 5
+_CAMELOT_MIN_ACCURACY = {'lattice': 0.8, 'stream': 0.6}
+# Lattice tables above this accuracy are not worth a second (stream) pass
+_CONFIDENT_ACCURACY = 0.9
+
 def extract_tables_stub(pdf_path: str) -> List[Dict]:
     """Legacy stub function for backward compatibility."""
     return extract_tables_production(pdf_path)
@@ -30,7 +53,7 @@ def extract_tables_production(pdf_path: str) -> List[Dict]:
     Returns:
         List of extracted tables with metadata
     """
-    if not EXTRACTION_AVAILABLE:
+    if not extraction_available():
         logger.error("PDF extraction libraries not available")
         return [{"page": 1, "rows": 0, "cols": 0, "engine": "unavailable", "error": "Libraries not installed"}]
     
@@ -38,20 +61,29 @@ def extract_tables_production(pdf_path: str) -> List[Dict]:
         logger.error(f"PDF file not found: {pdf_path}")
         return []
     
-    start_time = time.time()
+    start_time = time.monotonic()
     results = []
     
     try:
-        # Extract tables using both engines for maximum coverage
-        lattice_tables = _extract_with_camelot_lattice(pdf_path)
-        stream_tables = _extract_with_camelot_stream(pdf_path)
-        pdfplumber_tables = _extract_with_pdfplumber(pdf_path)
+        # pdfplumber runs first and stops early once the schedule budget is met;
+        # Camelot re-parses every page it is given, so it only gets that window
+        pdfplumber_tables, pages_scanned = _extract_with_pdfplumber(pdf_path)
+        lattice_tables = _extract_with_camelot_lattice(pdf_path, pages_scanned)
+        
+        # Stream re-parses the same window; skip it when lattice has already
+        # filled the schedule budget with confident tables
+        confident = sum(1 for table in lattice_tables if table['accuracy'] > _CONFIDENT_ACCURACY)
+        if confident >= max(settings.parser_max_schedules, 1):
+            logger.debug(f"Skipping Camelot stream for {pdf_path}: {confident} confident lattice tables")
+            stream_tables = []
+        else:
+            stream_tables = _extract_with_camelot_stream(pdf_path, pages_scanned)
         
         # Combine and deduplicate results
         all_tables = lattice_tables + stream_tables + pdfplumber_tables
         results = _deduplicate_tables(all_tables)
         
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         logger.info(f"Extracted {len(results)} tables from {pdf_path} in {processing_time:.2f}s")
         
         return results
@@ -60,75 +92,89 @@ def extract_tables_production(pdf_path: str) -> List[Dict]:
         logger.error(f"Table extraction failed for {pdf_path}: {e}")
         return [{"page": 1, "rows": 0, "cols": 0, "engine": "error", "error": str(e)}]
 
-def _extract_with_camelot_lattice(pdf_path: str) -> List[Dict]:
+def _extract_with_camelot_lattice(pdf_path: str, last_page: Optional[int] = None) -> List[Dict]:
     """Extract tables using Camelot lattice method (for tables with clear borders)."""
-    tables = []
-    
-    try:
-        logger.debug(f"Extracting lattice tables from {pdf_path}")
-        lattice_tables = camelot.read_pdf(pdf_path, pages='all', flavor='lattice')
-        
-        for table in lattice_tables:
-            if table.accuracy > 0.8:  # Quality threshold
-                df = table.df
-                
-                # Clean up the dataframe
-                df = df.replace('', None).dropna(how='all').dropna(axis=1, how='all')
-                
-                if not df.empty:
-                    tables.append({
-                        'type': 'lattice',
-                        'engine': 'camelot_lattice',
-                        'data': df.to_dict('records'),
-                        'accuracy': float(table.accuracy),
-                        'page': int(table.page),
-                        'rows': len(df),
-                        'cols': len(df.columns),
-                        'bbox': table._bbox if hasattr(table, '_bbox') else None,
-                        'extraction_method': 'lattice'
-                    })
-                    
-    except Exception as e:
-        logger.warning(f"Camelot lattice extraction failed: {e}")
-    
-    return tables
+    return _extract_with_camelot(pdf_path, 'lattice', last_page)
 
-def _extract_with_camelot_stream(pdf_path: str) -> List[Dict]:
+def _extract_with_camelot_stream(pdf_path: str, last_page: Optional[int] = None) -> List[Dict]:
     """Extract tables using Camelot stream method (for tables without clear borders)."""
+    return _extract_with_camelot(pdf_path, 'stream', last_page)
+
+def _extract_with_camelot(pdf_path: str, flavor: str, last_page: Optional[int]) -> List[Dict]:
+    """
+    Run one Camelot flavor over pages 1..last_page in small batches.
+    
+    Stops on the same schedule / empty-page budget as the pdfplumber pass
+    instead of parsing every page up front.
+    """
     tables = []
+    min_accuracy = _CAMELOT_MIN_ACCURACY[flavor]
     
     try:
-        logger.debug(f"Extracting stream tables from {pdf_path}")
-        stream_tables = camelot.read_pdf(pdf_path, pages='all', flavor='stream')
+        logger.debug(f"Extracting {flavor} tables from {pdf_path}")
+        if last_page is None:
+            import fitz  # PyMuPDF
+            
+            with fitz.open(pdf_path) as doc:
+                last_page = doc.page_count
         
-        for table in stream_tables:
-            if table.accuracy > 0.6:  # Lower threshold for stream
-                df = table.df
-                
-                # Clean up the dataframe
-                df = df.replace('', None).dropna(how='all').dropna(axis=1, how='all')
-                
-                if not df.empty:
-                    tables.append({
-                        'type': 'stream',
-                        'engine': 'camelot_stream',
-                        'data': df.to_dict('records'),
-                        'accuracy': float(table.accuracy),
-                        'page': int(table.page),
-                        'rows': len(df),
-                        'cols': len(df.columns),
-                        'bbox': table._bbox if hasattr(table, '_bbox') else None,
-                        'extraction_method': 'stream'
-                    })
+        max_tables = max(settings.parser_max_schedules, 1)
+        max_empty = max(settings.parser_max_empty_pages, 1)
+        schedules_found = 0
+        empty_streak = 0
+        
+        for batch_start in range(1, last_page + 1, _CAMELOT_BATCH_PAGES):
+            if schedules_found >= max_tables or empty_streak >= max_empty:
+                break
+            batch_end = min(batch_start + _CAMELOT_BATCH_PAGES - 1, last_page)
+            found = camelot.read_pdf(pdf_path, pages=f"{batch_start}-{batch_end}", flavor=flavor)
+            
+            tables_by_page: Dict[int, List[Dict]] = {}
+            for table in found:
+                if table.accuracy > min_accuracy:  # Quality threshold
+                    df = table.df
+                    
+                    # Drop blank rows and columns in one pass over the cells
+                    header, rows = _clean_table_rows([df.columns.tolist()] + df.values.tolist())
+                    
+                    if rows:
+                        tables_by_page.setdefault(int(table.page), []).append({
+                            'type': flavor,
+                            'engine': f'camelot_{flavor}',
+                            'data': [dict(zip(header, row)) for row in rows],
+                            'accuracy': float(table.accuracy),
+                            'page': int(table.page),
+                            'rows': len(rows),
+                            'cols': len(header),
+                            'bbox': table._bbox if hasattr(table, '_bbox') else None,
+                            'extraction_method': flavor
+                        })
+            
+            for page_num in range(batch_start, batch_end + 1):
+                if schedules_found >= max_tables or empty_streak >= max_empty:
+                    break
+                page_tables = tables_by_page.get(page_num, [])[:max_tables - schedules_found]
+                if page_tables:
+                    tables.extend(page_tables)
+                    schedules_found += len(page_tables)
+                    empty_streak = 0
+                else:
+                    empty_streak += 1
                     
     except Exception as e:
-        logger.warning(f"Camelot stream extraction failed: {e}")
+        logger.warning(f"Camelot {flavor} extraction failed: {e}")
     
     return tables
 
-def _extract_with_pdfplumber(pdf_path: str) -> List[Dict]:
-    """Extract tables using pdfplumber (fallback method)."""
+def _extract_with_pdfplumber(pdf_path: str) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Extract tables using pdfplumber (fallback method).
+    
+    Returns the tables and how many leading pages were scanned before the early
+    stop, or None when the scan failed and the window is unknown.
+    """
     tables = []
+    pages_scanned = None
     
     try:
         logger.debug(f"Extracting tables with pdfplumber from {pdf_path}")
@@ -138,6 +184,7 @@ def _extract_with_pdfplumber(pdf_path: str) -> List[Dict]:
             max_empty = max(settings.parser_max_empty_pages, 1)
             schedules_found = 0
             empty_streak = 0
+            pages_scanned = 0
 
             for page_num, page in enumerate(pdf.pages, 1):
                 if schedules_found >= max_tables or empty_streak >= max_empty:
@@ -149,6 +196,7 @@ def _extract_with_pdfplumber(pdf_path: str) -> List[Dict]:
                     )
                     break
 
+                pages_scanned = page_num
                 page_tables = page.extract_tables()
                 if not page_tables:
                     empty_streak += 1
@@ -157,21 +205,17 @@ def _extract_with_pdfplumber(pdf_path: str) -> List[Dict]:
                 page_had_tables = False
                 for table_idx, table in enumerate(page_tables):
                     if table and len(table) > 0:
-                        # Convert to DataFrame for consistency
-                        df = pd.DataFrame(table[1:], columns=table[0] if table[0] else [])
-
-                        # Clean up the dataframe
-                        df = df.replace('', None).dropna(how='all').dropna(axis=1, how='all')
+                        header, rows = _clean_table_rows(table)
 
-                        if not df.empty:
+                        if rows:
                             tables.append({
                                 'type': 'pdfplumber',
                                 'engine': 'pdfplumber',
-                                'data': df.to_dict('records'),
+                                'data': [dict(zip(header, row)) for row in rows],
                                 'accuracy': 0.7,  # Default confidence for pdfplumber
                                 'page': page_num,
-                                'rows': len(df),
-                                'cols': len(df.columns),
+                                'rows': len(rows),
+                                'cols': len(header),
                                 'table_index': table_idx,
                                 'extraction_method': 'pdfplumber'
                             })
@@ -187,32 +231,72 @@ def _extract_with_pdfplumber(pdf_path: str) -> List[Dict]:
                             
     except Exception as e:
         logger.warning(f"Pdfplumber extraction failed: {e}")
+        pages_scanned = None
     
-    return tables
+    return tables, pages_scanned
+
+def _clean_table_rows(table: List[List[Optional[str]]]) -> Tuple[List, List[List]]:
+    """
+    Drop blank rows and columns from a header row plus data rows.
+    
+    Empty strings count as missing and come back as None, matching what the
+    old DataFrame cleanup produced, without building a frame per table.
+    """
+    header = list(table[0]) if table[0] else []
+    rows = [
+        [None if cell == '' else cell for cell in row]
+        for row in table[1:]
+        if any(cell is not None and cell != '' for cell in row)
+    ]
+    keep_cols = [i for i in range(len(header)) if any(row[i] is not None for row in rows)]
+    if len(keep_cols) < len(header):
+        header = [header[i] for i in keep_cols]
+        rows = [[row[i] for i in keep_cols] for row in rows]
+    return header, rows
 
 def _deduplicate_tables(tables: List[Dict]) -> List[Dict]:
     """Remove duplicate tables based on content similarity."""
     if not tables:
         return tables
     
-    unique_tables = []
+    # Survivors are indexed by _similarity_key, so each table costs one dict
+    # lookup. They are keyed by arrival slot so a replacement is an O(1)
+    # delete + append, matching the old list order.
+    unique_tables: Dict[int, Dict] = {}
+    slot_by_key: Dict[Any, int] = {}
     
-    for table in tables:
-        is_duplicate = False
-        
-        for existing in unique_tables:
-            if _tables_are_similar(table, existing):
-                is_duplicate = True
-                # Keep the one with higher accuracy
-                if table.get('accuracy', 0) > existing.get('accuracy', 0):
-                    unique_tables.remove(existing)
-                    unique_tables.append(table)
-                break
-        
-        if not is_duplicate:
-            unique_tables.append(table)
+    for slot, table in enumerate(tables):
+        key = _similarity_key(table, slot)
+        existing_slot = slot_by_key.get(key)
+        if existing_slot is None:
+            unique_tables[slot] = table
+            slot_by_key[key] = slot
+        elif table.get('accuracy', 0) > unique_tables[existing_slot].get('accuracy', 0):
+            # Keep the one with higher accuracy
+            del unique_tables[existing_slot]
+            unique_tables[slot] = table
+            slot_by_key[key] = slot
     
-    return unique_tables
+    return list(unique_tables.values())
+
+def _similarity_key(table: Dict, slot: int) -> Any:
+    """
+    Hashable key under which _tables_are_similar tables collide.
+    
+    Similar tables share a page, a row count and their first rows; equal
+    records also have equal column sets, so the +/-1 tolerance never applies
+    in practice. Tables that can never match (no data, unhashable cells) get
+    a key of their own.
+    """
+    data = table.get('data', [])
+    if not data:
+        return ('unique', slot)
+    try:
+        sample = tuple(frozenset(row.items()) for row in data[:3])
+        hash(sample)
+    except (AttributeError, TypeError):
+        return ('unique', slot)
+    return (table.get('page'), len(data), sample)
 
 def _tables_are_similar(table1: Dict, table2: Dict) -> bool:
     """Check if two tables are similar based on page, size, and content."""
@@ -248,24 +332,25 @@ def apply_ledger_transformations(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
     
+    import pandas as pd
+    
     # Create a copy to avoid modifying original
     transformed_df = df.copy()
     
     try:
-        # Common ledger transformations
-        for col in transformed_df.columns:
-            # Convert numeric columns
-            if transformed_df[col].dtype == 'object':
-                # Try to convert to numeric, keeping original if fails
-                numeric_series = pd.to_numeric(transformed_df[col], errors='coerce')
-                if not numeric_series.isna().all():
-                    transformed_df[col] = numeric_series
-        
-        # Remove completely empty rows
-        transformed_df = transformed_df.dropna(how='all')
+        # Convert numeric columns: coerce all object columns in one pass and
+        # keep the original wherever nothing parsed as a number
+        object_positions = [i for i, dtype in enumerate(transformed_df.dtypes) if dtype == 'object']
+        if object_positions:
+            coerced = transformed_df.iloc[:, object_positions].apply(pd.to_numeric, errors='coerce')
+            has_numbers = coerced.notna().any().to_numpy()
+            for offset, position in enumerate(object_positions):
+                if has_numbers[offset]:
+                    transformed_df.isetitem(position, coerced.iloc[:, offset])
         
-        # Remove completely empty columns
-        transformed_df = transformed_df.dropna(axis=1, how='all')
+        # Remove completely empty rows and columns from a single NA mask
+        present = transformed_df.notna().to_numpy()
+        transformed_df = transformed_df.iloc[present.any(axis=1), present.any(axis=0)]
         
         # Standardize column names (remove extra whitespace, etc.)
         transformed_df.columns = [str(col).strip() for col in transformed_df.columns]
@@ -1,14 +1,56 @@
-from typing import List
+import io
+from typing import Iterator, List, Optional, Tuple
 import fitz  # PyMuPDF
 from pathlib import Path
 
-def render_pdf_preview(pdf_path: str) -> List[Path]:
-    doc = fitz.open(pdf_path)
+from apps.worker.config import settings
+
+# PNG is the default; JPEG (encoded by MuPDF itself) and WebP (through
+# Pillow) are opt-in lossy formats several times smaller per page
+_PREVIEW_SUFFIXES = {"jpeg": "jpg", "webp": "webp", "png": "png"}
+
+def render_pdf_preview(pdf_path: str, page_start: int = 0, page_end: Optional[int] = None) -> List[Path]:
+    """Render pages [page_start, page_end) to image files; only that range is decoded."""
+    suffix = _PREVIEW_SUFFIXES[_preview_format()]
     out_paths = []
-    for i, page in enumerate(doc, start=1):
-        pix = page.get_pixmap(dpi=72)
-        out = Path(f"/tmp/preview_{i}.png")
-        pix.save(out.as_posix())
+    for index, data in _render_pages(pdf_path, page_start, page_end):
+        out = Path(f"/tmp/preview_{index + 1}.{suffix}")
+        out.write_bytes(data)
         out_paths.append(out)
-    doc.close()
     return out_paths
+
+def _render_pages(pdf_path: str, page_start: int, page_end: Optional[int]) -> Iterator[Tuple[int, bytes]]:
+    fmt = _preview_format()
+    with fitz.open(pdf_path) as doc:
+        stop = doc.page_count if page_end is None else min(page_end, doc.page_count)
+        for index in range(page_start, stop):
+            page = doc.load_page(index)
+            pix = page.get_pixmap(matrix=_preview_matrix(page.rect))
+            if fmt == "jpeg":
+                yield index, pix.tobytes("jpeg", jpg_quality=settings.preview_quality)
+            elif fmt == "webp":
+                yield index, _encode_webp(pix)
+            else:
+                yield index, pix.tobytes("png")
+
+def _preview_matrix(rect) -> fitz.Matrix:
+    """Scale for PREVIEW_DPI, lowered so the long edge stays within PREVIEW_MAX_EDGE_PX."""
+    dpi = settings.preview_dpi
+    long_edge_pt = max(rect.width, rect.height)
+    if settings.preview_max_edge_px > 0 and long_edge_pt > 0:
+        # Drawings and plans would otherwise become 20+ megapixel pixmaps
+        dpi = min(dpi, settings.preview_max_edge_px * 72 / long_edge_pt)
+    zoom = dpi / 72
+    return fitz.Matrix(zoom, zoom)
+
+def _encode_webp(pix) -> bytes:
+    from PIL import Image
+    
+    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+    out = io.BytesIO()
+    image.save(out, "WEBP", quality=settings.preview_quality, method=4)
+    return out.getvalue()
+
+def _preview_format() -> str:
+    fmt = settings.preview_format.lower()
+    return fmt if fmt in _PREVIEW_SUFFIXES else "png"
@@ -1,4 +1,4 @@
-from apps.worker.worker.cancellation import cancellation_checkpoint, JobCancelledException
+from apps.worker.worker.cancellation import cancellation_checkpoint, forget_job, JobCancelledException
 from apps.worker.worker.services import get_job, mark_job_completed, mark_job_failed, update_job_schedules
 from apps.worker.worker.ocr import estimate_page_count, extract_schedules
 from apps.worker.worker.costs import record_job_cost, mark_cost_success, mark_cost_failed
@@ -34,3 +34,5 @@ async def process_job(job_id: str):
         log.exception(f"Job {job_id} failed: {e}")
         await mark_job_failed(job_id, str(e))
         await mark_cost_failed(job_id)
+    finally:
+        forget_job(job_id)
@@ -2,16 +2,33 @@
 Celery tasks for document processing with comprehensive error handling and monitoring.
 """
 import logging
+import os
+import random
 import time
 from typing import Dict, Any, Optional
-from celery import Celery
+from celery import Celery, group
 from celery.exceptions import Retry, WorkerLostError
+from celery.signals import worker_init, worker_process_init
+from .aws_client import WorkerS3Client, CircuitBreakerOpenError, get_boto3_session
 from .services import DocumentProcessor
 from .database import WorkerDatabase
 from .models import ProcessingStatus, EventType
 
 logger = logging.getLogger(__name__)
 
+RETRY_BACKOFF_BASE_SECONDS = 60
+RETRY_BACKOFF_CAP_SECONDS = 900
+
+def _retry_delay_with_jitter(retries: int) -> int:
+    """
+    Full-jitter exponential backoff for task retries.
+    
+    Spreading retries uniformly over [0, min(cap, base * 2**retries)] keeps
+    workers that failed together from hammering S3/DB again in lockstep.
+    """
+    ceiling = min(RETRY_BACKOFF_CAP_SECONDS, RETRY_BACKOFF_BASE_SECONDS * (2 ** retries))
+    return int(random.uniform(0, ceiling))
+
 # Configure Celery
 celery_app = Celery(
     'ledger_lift_worker',
@@ -58,7 +75,7 @@ def process_document_task(self, doc_id: str) -> Dict[str, Any]:
         Dictionary with processing results and metadata
     """
     task_id = self.request.id
-    start_time = time.time()
+    start_time = time.monotonic()
     
     logger.info(f"Starting document processing task: {doc_id} (task_id: {task_id})")
     
@@ -69,7 +86,7 @@ def process_document_task(self, doc_id: str) -> Dict[str, Any]:
         # Process the document
         result = processor.process_document(doc_id, timeout_seconds=1500)  # 25 minutes
         
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         
         logger.info(f"Document processing completed successfully: {doc_id} in {processing_time:.2f}s")
         
@@ -82,7 +99,7 @@ def process_document_task(self, doc_id: str) -> Dict[str, Any]:
         }
         
     except Exception as exc:
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         error_msg = f"Document processing failed: {str(exc)}"
         
         logger.error(f"Document processing failed: {doc_id} - {error_msg}", exc_info=True)
@@ -100,9 +117,22 @@ def process_document_task(self, doc_id: str) -> Dict[str, Any]:
         except Exception as db_error:
             logger.error(f"Failed to update document status: {db_error}")
         
-        # Determine if we should retry
+        # Determine if we should retry. An open circuit breaker means S3 is
+        # known to be down; retrying would only re-queue work that fails fast.
+        if isinstance(exc, CircuitBreakerOpenError):
+            logger.error(f"Document processing not retried: {doc_id} - S3 circuit breaker is open")
+            
+            return {
+                'success': False,
+                'document_id': doc_id,
+                'task_id': task_id,
+                'error': error_msg,
+                'processing_time': processing_time,
+                'retries_exhausted': False
+            }
+        
         if self.request.retries < self.max_retries:
-            retry_delay = 60 * (2 ** self.request.retries)  # Exponential backoff
+            retry_delay = _retry_delay_with_jitter(self.request.retries)
             logger.info(f"Retrying document processing: {doc_id} in {retry_delay}s (attempt {self.request.retries + 1}/{self.max_retries})")
             
             raise self.retry(
@@ -130,13 +160,13 @@ def health_check_task(self) -> Dict[str, Any]:
     Returns:
         Dictionary with health status information
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     
     try:
         processor = DocumentProcessor()
         health_status = processor.health_check()
         
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         
         return {
             'success': True,
@@ -146,7 +176,7 @@ def health_check_task(self) -> Dict[str, Any]:
         }
         
     except Exception as exc:
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         error_msg = f"Health check failed: {str(exc)}"
         
         logger.error(f"Health check failed: {error_msg}", exc_info=True)
@@ -170,7 +200,7 @@ def batch_process_documents_task(self, doc_ids: list) -> Dict[str, Any]:
         Dictionary with batch processing results
     """
     task_id = self.request.id
-    start_time = time.time()
+    start_time = time.monotonic()
     
     logger.info(f"Starting batch processing: {len(doc_ids)} documents (task_id: {task_id})")
     
@@ -182,22 +212,25 @@ def batch_process_documents_task(self, doc_ids: list) -> Dict[str, Any]:
     }
     
     try:
-        for doc_id in doc_ids:
-            try:
-                # Process each document
-                result = process_document_task.delay(doc_id)
+        try:
+            # Publish the whole batch through one producer connection instead of a
+            # broker round-trip per .delay(); children come back in doc_ids order
+            group_result = group(process_document_task.s(doc_id) for doc_id in doc_ids).apply_async()
+            for doc_id, result in zip(doc_ids, group_result.results):
                 results['successful'].append({
                     'document_id': doc_id,
                     'task_id': result.id
                 })
-            except Exception as exc:
-                logger.error(f"Failed to queue document {doc_id}: {exc}")
-                results['failed'].append({
-                    'document_id': doc_id,
-                    'error': str(exc)
-                })
+        except Exception as exc:
+            # Part of the group may already be published, so re-queueing one by one
+            # could run documents twice; report the batch as failed instead
+            logger.error(f"Failed to queue batch of {len(doc_ids)} documents: {exc}")
+            results['failed'] = [
+                {'document_id': doc_id, 'error': str(exc)}
+                for doc_id in doc_ids
+            ]
         
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         
         logger.info(f"Batch processing queued: {len(results['successful'])} successful, {len(results['failed'])} failed in {processing_time:.2f}s")
         
@@ -208,7 +241,7 @@ def batch_process_documents_task(self, doc_ids: list) -> Dict[str, Any]:
         }
         
     except Exception as exc:
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         error_msg = f"Batch processing failed: {str(exc)}"
         
         logger.error(f"Batch processing failed: {error_msg}", exc_info=True)
@@ -220,6 +253,30 @@ def batch_process_documents_task(self, doc_ids: list) -> Dict[str, Any]:
             'processing_time': processing_time
         }
 
+@worker_init.connect
+def resolve_aws_credentials(**kwargs):
+    """
+    Resolve AWS role credentials once in the parent worker before it forks.
+    
+    Prefork children inherit the cached boto3 session with its credentials
+    already loaded, so a pool start issues one IMDS/STS lookup instead of one
+    per child. Each child still refreshes on its own when the credentials expire.
+    """
+    if os.getenv('USE_AWS', 'false').lower() != 'true':
+        return
+    try:
+        get_boto3_session().get_credentials()
+    except Exception as exc:
+        logger.warning(f"Failed to resolve AWS credentials on worker start: {exc}")
+
+@worker_process_init.connect
+def prime_s3_client(**kwargs):
+    """Build the shared S3 client and check bucket access once per worker process."""
+    try:
+        WorkerS3Client().verify_bucket_access()
+    except Exception as exc:
+        logger.warning(f"Failed to prime S3 client on worker start: {exc}")
+
 # Celery signal handlers for monitoring
 @celery_app.task(bind=True)
 def task_prerun_handler(sender, task_id, task, args, kwargs, **kwds):